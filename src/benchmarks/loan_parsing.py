@@ -0,0 +1,69 @@
+import sys
+import csv
+import random
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from core.models.loan import Loan
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+HEADERS = ['ISBN', 'UserID', 'LoanDate', 'ReturnDate']
+
+def legacy_from_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'ISBN': data['ISBN'],
+        'UserID': data['UserID'],
+        'LoanDate': datetime.strptime(data['LoanDate'], DATE_FORMAT) if data.get('LoanDate') else datetime.now(),
+        'ReturnDate': datetime.strptime(data['ReturnDate'], DATE_FORMAT) if data.get('ReturnDate') else None
+    }
+
+def write_loans(path: Path, count: int) -> None:
+    random.seed(42)
+    start = datetime(2015, 1, 1)
+    with path.open("w", newline="", encoding="utf-8-sig") as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADERS)
+        for _ in range(count):
+            loaned = start + timedelta(seconds=random.uniform(0, 10 * 365 * 86400))
+            returned = loaned + timedelta(seconds=random.uniform(3600, 45 * 86400)) if random.random() < 0.9 else None
+            writer.writerow([
+                f"978{random.randrange(50_000):010d}",
+                f"U{random.randrange(20_000):06d}",
+                loaned.strftime(DATE_FORMAT),
+                returned.strftime(DATE_FORMAT) if returned else ''
+            ])
+
+def load(path: Path, factory: Callable[[Dict[str, Any]], Any]) -> float:
+    started = time.perf_counter()
+    with path.open("r", encoding="utf-8-sig") as file:
+        items: List[Any] = [factory(row) for row in csv.DictReader(file)]
+    elapsed = time.perf_counter() - started
+    del items
+    return elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara o tempo de carga do loans.csv com strptime e com o parser rápido")
+    parser.add_argument("rows", nargs="?", type=int, default=1_000_000, help="Quantidade de empréstimos no arquivo gerado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "loans.csv"
+        write_loans(path, args.rows)
+
+        legacy = load(path, legacy_from_dict)
+        fast = load(path, Loan.from_dict)
+
+    print(f"Linhas: {args.rows}")
+    print(f"strptime:      {legacy:8.2f} s")
+    print(f"parser rápido: {fast:8.2f} s")
+    print(f"Aceleração:    {legacy / fast:8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import sys
+import csv
+import gc
+import io
+import random
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.append(str(PROJECT_ROOT))
+
+from core.models.book import Book
+from core.models.user import User
+from core.models.loan import Loan
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+@dataclass
+class LegacyBook:
+    Title: str
+    Author: str
+    Year: str
+    ISBN: str
+    Category: str
+
+@dataclass
+class LegacyUser:
+    Name: str
+    Email: str
+    ID: str
+    Type: str
+
+@dataclass
+class LegacyLoan:
+    ISBN: str
+    UserID: str
+    LoanDate: datetime
+    ReturnDate: Optional[datetime] = None
+
+def legacy_loan(data: Dict[str, Any]) -> LegacyLoan:
+    return LegacyLoan(
+        ISBN=data['ISBN'],
+        UserID=data['UserID'],
+        LoanDate=datetime.strptime(data['LoanDate'], DATE_FORMAT),
+        ReturnDate=datetime.strptime(data['ReturnDate'], DATE_FORMAT) if data['ReturnDate'] else None
+    )
+
+def generate_rows(count: int) -> Dict[str, List[Dict[str, str]]]:
+    random.seed(42)
+    categories = ['Romance', 'Ficção', 'Poesia', 'História', 'Ciência', 'Tecnologia']
+    types = ['Estudante', 'Professor', 'Visitante']
+    isbns = [f"978{random.randrange(10**10):010d}" for _ in range(max(1, count // 20))]
+    user_ids = [f"U{index:06d}" for index in range(max(1, count // 50))]
+    start = datetime(2020, 1, 1)
+
+    def date(offset_days: float) -> str:
+        return (start + timedelta(days=offset_days)).strftime(DATE_FORMAT)
+
+    loans = []
+    for _ in range(count):
+        loaned = random.uniform(0, 1500)
+        loans.append({
+            'ISBN': random.choice(isbns),
+            'UserID': random.choice(user_ids),
+            'LoanDate': date(loaned),
+            'ReturnDate': date(loaned + random.uniform(1, 45)) if random.random() < 0.9 else ''
+        })
+
+    return {
+        'books': [
+            {
+                'Title': f"Livro {index}",
+                'Author': f"Autor {index % 997}",
+                'Year': str(random.randint(1900, 2024)),
+                'ISBN': random.choice(isbns),
+                'Category': random.choice(categories)
+            }
+            for index in range(count)
+        ],
+        'users': [
+            {
+                'Name': f"Usuário {index}",
+                'Email': f"usuario{index}@exemplo.com",
+                'ID': random.choice(user_ids),
+                'Type': random.choice(types)
+            }
+            for index in range(count)
+        ],
+        'loans': loans
+    }
+
+def to_csv(rows: List[Dict[str, str]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def measure(text: str, count: int, factory: Callable[[Dict[str, str]], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = [factory(row) for row in csv.DictReader(io.StringIO(text))]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mede o consumo de memória por registro dos modelos")
+    parser.add_argument("rows", nargs="?", type=int, default=50_000, help="Quantidade de registros por modelo")
+    args = parser.parse_args()
+
+    rows = generate_rows(args.rows)
+    cases = [
+        ("Book", rows['books'], lambda row: LegacyBook(**row), Book.from_dict),
+        ("User", rows['users'], lambda row: LegacyUser(**row), User.from_dict),
+        ("Loan", rows['loans'], legacy_loan, Loan.from_dict)
+    ]
+
+    print(f"{'Modelo':<8}{'Antes (B/linha)':>18}{'Depois (B/linha)':>18}{'Redução':>10}")
+    for name, model_rows, legacy, current in cases:
+        text = to_csv(model_rows)
+        legacy_size = measure(text, len(model_rows), legacy)
+        current_size = measure(text, len(model_rows), current)
+        print(f"{name:<8}{legacy_size:>18.1f}{current_size:>18.1f}{1 - current_size / legacy_size:>10.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,82 @@
 import sys
+import argparse
+from datetime import datetime, timedelta
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from shared.logger import Logger
-from cli.views.main_menu import MainMenu
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Biblioteca Digital - interface de linha de comando")
+    subparsers = parser.add_subparsers(dest="command")
+
+    migrate = subparsers.add_parser("migrate", help="Migra os arquivos CSV para o banco SQLite")
+    migrate.add_argument("--overwrite", action="store_true", help="Substitui dados já existentes no SQLite")
+
+    partition = subparsers.add_parser("partition-loans", help="Divide o histórico de empréstimos em arquivos mensais")
+    partition.add_argument("--overwrite", action="store_true", help="Refaz um particionamento já existente")
+
+    archive = subparsers.add_parser("archive-loans", help="Comprime as partições mensais de empréstimos já encerradas")
+    archive.add_argument("--before", help="Arquiva os meses anteriores a AAAA-MM (padrão: mês atual)")
+    archive.add_argument("--codec", choices=["gzip", "lzma"], default="gzip", help="Algoritmo de compressão")
+
+    importer = subparsers.add_parser("import", help="Importa livros ou usuários de um arquivo CSV ou JSONL")
+    importer.add_argument("kind", choices=["books", "users"], help="Tipo de registro a importar")
+    importer.add_argument("path", help="Arquivo .csv ou .jsonl de origem")
+    importer.add_argument("--rejects", help="Arquivo CSV para os registros rejeitados")
+    importer.add_argument("--workers", type=int, help="Quantidade de processos de validação")
+    importer.add_argument("--chunk-size", type=int, default=1000, help="Registros validados por lote")
+
+    exporter = subparsers.add_parser("export", help="Exporta livros, usuários ou empréstimos para CSV ou JSONL")
+    exporter.add_argument("kind", choices=["books", "users", "loans"], help="Tipo de registro a exportar")
+    exporter.add_argument("path", help="Arquivo de destino (.csv, .jsonl, opcionalmente com .gz)")
+    exporter.add_argument("--format", choices=["csv", "jsonl"], help="Formato de saída (padrão: pela extensão)")
+    exporter.add_argument("--join", action="store_true", help="Inclui título do livro e nome do usuário nos empréstimos")
+    exporter.add_argument("--since", type=datetime.fromisoformat, help="Empréstimos com atividade a partir de AAAA-MM-DD")
+    exporter.add_argument("--until", type=datetime.fromisoformat, help="Empréstimos com atividade até AAAA-MM-DD (inclusive)")
+    exporter.add_argument("--incremental", action="store_true", help="Apenas empréstimos com atividade desde a última exportação")
+
+    return parser.parse_args()
 
 def main() -> None:
+    args = parse_args()
+
     try:
-        MainMenu().display()
+        if args.command == "migrate":
+            from core.controllers.storage_controller import StorageController
+            for name, count in StorageController().migrate_csv_to_sqlite(overwrite=args.overwrite).items():
+                print(f"{name}: {count} registros migrados")
+        elif args.command == "partition-loans":
+            from core.controllers.storage_controller import StorageController
+            for name, count in StorageController().partition_loans(overwrite=args.overwrite).items():
+                print(f"{name}: {count} empréstimos")
+        elif args.command == "archive-loans":
+            from core.controllers.storage_controller import StorageController
+            for name, count in StorageController().archive_loans(before=args.before, codec=args.codec).items():
+                print(f"{name}: {count} empréstimos arquivados")
+        elif args.command == "import":
+            from core.controllers.import_controller import ImportController
+            controller = ImportController()
+            run_import = controller.import_books if args.kind == "books" else controller.import_users
+            result = run_import(args.path, rejects_path=args.rejects, workers=args.workers, chunk_size=args.chunk_size)
+            print(f"{result.accepted} registros importados, {result.rejected} rejeitados")
+            if result.rejects_path:
+                print(f"Registros rejeitados em {result.rejects_path}")
+        elif args.command == "export":
+            from core.controllers.export_controller import ExportController
+            until = args.until + timedelta(days=1) if args.until else None
+            count = ExportController().export(
+                args.kind, args.path, file_format=args.format, join=args.join,
+                since=args.since, until=until, incremental=args.incremental
+            )
+            print(f"{count} registros exportados para {args.path}")
+        else:
+            from cli.views.main_menu import MainMenu
+            MainMenu().display()
     except Exception as e:
         Logger.error(f"Erro: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -81,6 +81,10 @@ class UserCommand(BaseCommand[UsersController]):
     def search(self) -> None:
         term = input("\n🔍 Termo de busca: ")
         results = self.controller.search_term(term)
+        if not results:
+            results = self.controller.search_fuzzy(term)
+            if results:
+                self.console.print("\n[yellow]Nenhum resultado exato. Resultados aproximados:[/yellow]")
         
         if not results:
             self.console.print("\n[yellow]Nenhum livro encontrado.[/yellow]")
@@ -1,10 +1,10 @@
-from typing import List, TypeVar, Generic
-from shared.file_manager import FileManager, BaseModel
+from typing import Any, List, Optional, TypeVar, Generic
+from shared.storage import Storage, BaseModel
 
 T = TypeVar('T', bound=BaseModel)
 
 class BaseController(Generic[T]):
-    def __init__(self, file_manager: FileManager[T]):
+    def __init__(self, file_manager: Storage[T]):
         self.file_manager = file_manager
 
     def list_all(self) -> List[T]:
@@ -13,10 +13,23 @@ class BaseController(Generic[T]):
     def add(self, item: T) -> None:
         self.file_manager.add_data(item)
 
+    def add_many(self, items: List[T]) -> None:
+        self.file_manager.add_many(items)
+
+    def find_by(self, index_name: str, key: Any) -> Optional[T]:
+        return self.file_manager.lookup(index_name, key)
+
+    def find_all_by(self, index_name: str, key: Any) -> List[T]:
+        return self.file_manager.lookup_all(index_name, key)
+
+    def complete(self, index_name: str, prefix: str, limit: int = 10) -> List[str]:
+        return self.file_manager.complete(index_name, prefix, limit)
+
+    def suggest(self, index_name: str, prefix: str, limit: int = 10) -> List[T]:
+        return self.file_manager.suggest(index_name, prefix, limit)
+
     def remove(self, item: T) -> None:
-        items = self.list_all()
-        items.remove(item)
-        self.file_manager.update_data(items)
+        self.file_manager.remove_data(item)
 
     def update_all(self, items: List[T]) -> None:
         self.file_manager.update_data(items)
\ No newline at end of file
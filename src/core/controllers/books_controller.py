@@ -1,42 +1,94 @@
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from core.models.book import Book
-from shared.file_manager import FileManager
+from shared.storage import open_storage
+from shared.indexes import KeyIndex, CounterIndex, TrigramIndex, PrefixIndex, FuzzyIndex
 from core.controllers.base_controller import BaseController
 
 class BooksController(BaseController[Book]):
-    def __init__(self) -> None:
-        super().__init__(FileManager(
-            filename='data/books.csv',
+    def __init__(self, backend: Optional[str] = None) -> None:
+        super().__init__(open_storage(
+            name='books',
             headers=['Title', 'Author', 'Year', 'ISBN', 'Category'],
-            model_class=Book
+            model_class=Book,
+            indexes={
+                'ISBN': KeyIndex(field='ISBN'),
+                'by_Category': CounterIndex(field='Category'),
+                'trigrams': TrigramIndex(['Title', 'Author', 'Category', 'Year', 'ISBN']),
+                'completions': PrefixIndex(['Title', 'Author', 'Category', 'ISBN']),
+                'fuzzy': FuzzyIndex(['Title', 'Author', 'Category'])
+            },
+            primary_key=('ISBN',),
+            indexed_columns=[('Category',)],
+            backend=backend
         ))
 
     def search_term(self, term: str) -> List[Book]:
-        term_lower = term.lower()
-        
-        return [
-            book for book in self.list_all()
-            if any(term_lower in getattr(book, attr).lower() for attr in ['Title', 'Author', 'Category', 'Year', 'ISBN'])
-        ]
+        return self.find_all_by('trigrams', term)
+
+    def search_fuzzy(self, term: str, limit: int = 20) -> List[Book]:
+        return self.find_all_by('fuzzy', term)[:limit]
+
+    def autocomplete(self, prefix: str, limit: int = 8) -> List[str]:
+        return self.complete('completions', prefix, limit)
+
+    def suggest_books(self, prefix: str, limit: int = 8) -> List[Book]:
+        return self.suggest('completions', prefix, limit)
 
     def register_book(self, book_data: Dict[str, str]) -> None:
+        self.add(self._build_book(book_data, self._stored_key_error))
+
+    def register_books(self, books_data: List[Dict[str, str]]) -> int:
+        claim = self.key_claimer()
+        books: List[Book] = []
+        errors: List[str] = []
+
+        for position, book_data in enumerate(books_data, 1):
+            try:
+                books.append(self._build_book(book_data, claim))
+            except ValueError as e:
+                errors.append(f"Registro {position}: {e}")
+
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        self.add_many(books)
+        return len(books)
+
+    def key_claimer(self) -> Callable[[Dict[str, str]], Optional[str]]:
+        known_isbns = {row['ISBN'] for row in self.file_manager.iter_data(fields=['ISBN'])}
+
+        def claim(book_data: Dict[str, str]) -> Optional[str]:
+            if book_data['ISBN'] in known_isbns:
+                return "ISBN já cadastrado!"
+
+            known_isbns.add(book_data['ISBN'])
+            return None
+
+        return claim
+
+    def _stored_key_error(self, book_data: Dict[str, str]) -> Optional[str]:
+        return "ISBN já cadastrado!" if self.isbn_exists(book_data['ISBN']) else None
+
+    def _build_book(self, book_data: Dict[str, str], key_error: Callable[[Dict[str, str]], Optional[str]]) -> Book:
         required_fields = {"Title", "Author", "Year", "ISBN", "Category"}
         missing_fields = [field for field in required_fields if not book_data.get(field)]
 
         if missing_fields:
             raise ValueError("Todos os campos são obrigatórios!")
-        elif self.isbn_exists(book_data["ISBN"]):
-            raise ValueError("ISBN já cadastrado!")
 
-        self.add(Book(**book_data))
+        error = key_error(book_data)
+        if error:
+            raise ValueError(error)
+
+        return Book(**book_data)
 
     def delete_book(self, isbn: str | int) -> None:
         isbn = str(isbn)
-        book_to_remove = next((book for book in self.list_all() if book.ISBN == isbn), None)
+        book_to_remove = self.find_by('ISBN', isbn)
 
         if not book_to_remove:
             raise ValueError("Livro não encontrado!")
         self.remove(book_to_remove)
 
     def isbn_exists(self, isbn: str) -> bool:
-        return any(book.ISBN == isbn for book in self.list_all())
+        return self.file_manager.exists('ISBN', 'ISBN', isbn)
@@ -0,0 +1,157 @@
+import csv
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+from core.controllers.base_controller import BaseController
+from core.controllers.books_controller import BooksController
+from core.controllers.users_controller import UsersController
+from core.controllers.loans_controller import LoansController
+from core.models.loan import format_stamp, parse_stamp, to_stamp
+from shared.logger import Logger
+from shared.partitioned_storage import PartitionedStorage
+from shared import config
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+class ExportController:
+    def __init__(self, backend: Optional[str] = None) -> None:
+        self.books = BooksController(backend)
+        self.users = UsersController(backend)
+        self.loans = LoansController(backend)
+        self.state_path: Path = Path(config.DATA_DIR) / "exports.json"
+
+    def export(
+        self,
+        dataset: str,
+        path: str,
+        file_format: Optional[str] = None,
+        join: bool = False,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        incremental: bool = False
+    ) -> int:
+        controllers: Dict[str, BaseController] = {'books': self.books, 'users': self.users, 'loans': self.loans}
+        if dataset not in controllers:
+            raise ValueError(f"Conjunto de dados desconhecido: {dataset}")
+        if dataset != 'loans' and (since or until or incremental or join):
+            raise ValueError("Filtros de data e junções só se aplicam a empréstimos.")
+
+        target = Path(path)
+        file_format = file_format or self._infer_format(target)
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato de exportação inválido: {file_format}")
+
+        advances_watermark = dataset == 'loans' and (incremental or (since is None and until is None))
+        if incremental:
+            last_export = self.last_export(dataset)
+            since = max(since, last_export) if since and last_export else since or last_export
+
+        started = datetime.now()
+        storage = controllers[dataset].file_manager
+        fields = list(storage.headers)
+        where = self._date_filter(since, until)
+        if where is not None and isinstance(storage, PartitionedStorage):
+            lower = format_stamp(to_stamp(since)) if since else None
+            upper = format_stamp(to_stamp(until)) if until else None
+            rows = storage.iter_overlapping(['LoanDate', 'ReturnDate'], lower, upper, fields=fields, where=where)
+        else:
+            rows = storage.iter_data(fields=fields, where=where)
+        if join:
+            fields, rows = fields + ['Title', 'UserName'], self._join_loans(rows)
+
+        try:
+            with self._open(target) as file:
+                count = self._write(file, file_format, fields, rows)
+        except Exception as e:
+            Logger.error(f"Error exporting {dataset} to {target}: {e}")
+            raise
+
+        if advances_watermark:
+            self._save_last_export(dataset, min(started, until) if until else started)
+        Logger.info(f"Exported {count} {dataset} rows to {target}")
+        return count
+
+    @staticmethod
+    def _infer_format(target: Path) -> str:
+        suffixes = [suffix.lower() for suffix in target.suffixes if suffix.lower() != ".gz"]
+        return "jsonl" if suffixes and suffixes[-1] in (".jsonl", ".ndjson") else "csv"
+
+    @staticmethod
+    def _open(target: Path) -> TextIO:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.suffix.lower() == ".gz":
+            return gzip.open(target, "wt", encoding="utf-8", newline="")
+        return target.open("w", encoding="utf-8", newline="")
+
+    @staticmethod
+    def _date_filter(since: Optional[datetime], until: Optional[datetime]) -> Optional[Callable[[Dict[str, Any]], bool]]:
+        if since is None and until is None:
+            return None
+
+        lower = to_stamp(since) if since else None
+        upper = to_stamp(until) if until else None
+
+        def in_range(text: str) -> bool:
+            if not text:
+                return False
+            stamp = parse_stamp(text)
+            return (lower is None or stamp >= lower) and (upper is None or stamp < upper)
+
+        return lambda row: in_range(row['LoanDate']) or in_range(row['ReturnDate'])
+
+    def _join_loans(self, rows: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        titles = {row['ISBN']: row['Title'] for row in self.books.file_manager.iter_data(fields=['ISBN', 'Title'])}
+        names = {row['ID']: row['Name'] for row in self.users.file_manager.iter_data(fields=['ID', 'Name'])}
+
+        for row in rows:
+            row['Title'] = titles.get(row['ISBN'], '')
+            row['UserName'] = names.get(row['UserID'], '')
+            yield row
+
+    @staticmethod
+    def _write(file: TextIO, file_format: str, fields: List[str], rows: Iterator[Dict[str, Any]]) -> int:
+        count = 0
+        if file_format == "jsonl":
+            for row in rows:
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+                count += 1
+            return count
+
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+
+    def last_export(self, dataset: str) -> Optional[datetime]:
+        try:
+            with self.state_path.open("r", encoding="utf-8") as file:
+                value = json.load(file).get(dataset)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            Logger.warning(f"Ignoring unreadable export state {self.state_path}: {e}")
+            return None
+
+        return datetime.fromisoformat(value) if value else None
+
+    def _save_last_export(self, dataset: str, started: datetime) -> None:
+        try:
+            with self.state_path.open("r", encoding="utf-8") as file:
+                state = json.load(file)
+        except Exception:
+            state = {}
+
+        state[dataset] = started.isoformat()
+        temp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump(state, file)
+            os.replace(temp_path, self.state_path)
+        except Exception as e:
+            Logger.error(f"Error saving export state to {self.state_path}: {e}")
\ No newline at end of file
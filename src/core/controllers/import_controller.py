@@ -0,0 +1,164 @@
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TextIO, Tuple
+from core.controllers.base_controller import BaseController
+from core.controllers.books_controller import BooksController
+from core.controllers.users_controller import UsersController, EMAIL_PATTERN
+from core.models.book import Book
+from core.models.user import User
+from core.models.import_result import ImportResult
+from shared.helpers import validate_isbn, validate_year
+from shared.logger import Logger
+
+BOOK_FIELDS = ['Title', 'Author', 'Year', 'ISBN', 'Category']
+USER_FIELDS = ['Name', 'Email', 'ID', 'Type']
+
+Record = Tuple[int, Dict[str, str], Optional[str]]
+
+def validate_books(chunk: List[Record]) -> List[Record]:
+    return [(line, row, error or book_error(row)) for line, row, error in chunk]
+
+def validate_users(chunk: List[Record]) -> List[Record]:
+    return [(line, row, error or user_error(row)) for line, row, error in chunk]
+
+def book_error(row: Dict[str, str]) -> Optional[str]:
+    if not all(row[field] for field in BOOK_FIELDS):
+        return "Todos os campos são obrigatórios!"
+    elif not validate_isbn(row['ISBN']):
+        return "ISBN inválido!"
+    elif not validate_year(row['Year']):
+        return "Ano inválido!"
+    return None
+
+def user_error(row: Dict[str, str]) -> Optional[str]:
+    if not all(row[field] for field in USER_FIELDS):
+        return "Todos os campos são obrigatórios!"
+    elif not EMAIL_PATTERN.match(row['Email']):
+        return "Email inválido!"
+    elif row['Type'] not in User.ALLOWED_TYPES:
+        return f"Tipo inválido, o tipo deve ser um dos tipos válidos: {User.ALLOWED_TYPES}"
+    return None
+
+class ImportController:
+    def __init__(self, backend: Optional[str] = None) -> None:
+        self.books = BooksController(backend)
+        self.users = UsersController(backend)
+
+    def import_books(
+        self,
+        path: str,
+        rejects_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000
+    ) -> ImportResult:
+        return self._import(path, BOOK_FIELDS, validate_books, self.books.key_claimer(), Book, self.books, rejects_path, workers, chunk_size)
+
+    def import_users(
+        self,
+        path: str,
+        rejects_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = 1000
+    ) -> ImportResult:
+        return self._import(path, USER_FIELDS, validate_users, self.users.key_claimer(), User, self.users, rejects_path, workers, chunk_size)
+
+    def _import(
+        self,
+        path: str,
+        fields: List[str],
+        validate: Callable[[List[Record]], List[Record]],
+        claim: Callable[[Dict[str, str]], Optional[str]],
+        model_class: Any,
+        controller: BaseController,
+        rejects_path: Optional[str],
+        workers: Optional[int],
+        chunk_size: int
+    ) -> ImportResult:
+        source = Path(path)
+        if not source.exists():
+            raise ValueError(f"Arquivo não encontrado: {source}")
+
+        result = ImportResult(rejects_path=Path(rejects_path) if rejects_path else source.with_name(f"{source.stem}.rejects.csv"))
+        accepted: List[Any] = []
+        rejects_file: Optional[TextIO] = None
+        rejects_writer: Optional[csv.DictWriter] = None
+
+        try:
+            records = self._read_records(source, fields)
+            chunks = iter(lambda: list(islice(records, chunk_size)), [])
+            for checked in self._validate_chunks(chunks, validate, workers):
+                for line, row, error in checked:
+                    error = error or claim(row)
+                    if error is None:
+                        accepted.append(model_class(**row))
+                        continue
+
+                    if rejects_writer is None:
+                        rejects_file = result.rejects_path.open("w", newline="", encoding="utf-8-sig")
+                        rejects_writer = csv.DictWriter(rejects_file, fieldnames=['Linha', 'Erro', *fields])
+                        rejects_writer.writeheader()
+                    rejects_writer.writerow({'Linha': line, 'Erro': error, **row})
+                    result.rejected += 1
+
+            controller.add_many(accepted)
+            result.accepted = len(accepted)
+        except Exception as e:
+            Logger.error(f"Error importing {source}: {e}")
+            raise
+        finally:
+            if rejects_file is not None:
+                rejects_file.close()
+
+        if not result.rejected:
+            result.rejects_path = None
+        Logger.info(f"Imported {result.accepted} rows from {source} ({result.rejected} rejected)")
+        return result
+
+    def _read_records(self, source: Path, fields: List[str]) -> Iterator[Record]:
+        with source.open("r", encoding="utf-8-sig") as file:
+            if source.suffix.lower() in (".jsonl", ".ndjson"):
+                for line, text in enumerate(file, 1):
+                    if not text.strip():
+                        continue
+                    try:
+                        data = json.loads(text)
+                    except json.JSONDecodeError:
+                        yield line, {field: '' for field in fields}, "JSON inválido!"
+                        continue
+                    if not isinstance(data, dict):
+                        yield line, {field: '' for field in fields}, "JSON inválido!"
+                        continue
+                    yield line, self._normalize(data, fields), None
+            else:
+                reader = csv.DictReader(file)
+                for data in reader:
+                    yield reader.line_num, self._normalize(data, fields), None
+
+    @staticmethod
+    def _normalize(data: Dict[str, Any], fields: List[str]) -> Dict[str, str]:
+        return {field: str(data.get(field) or '').strip() for field in fields}
+
+    def _validate_chunks(
+        self,
+        chunks: Iterator[List[Record]],
+        validate: Callable[[List[Record]], List[Record]],
+        workers: Optional[int]
+    ) -> Iterator[List[Record]]:
+        if workers == 1:
+            yield from map(validate, chunks)
+            return
+
+        max_pending = (workers or os.cpu_count() or 1) * 2
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(validate, chunk))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
\ No newline at end of file
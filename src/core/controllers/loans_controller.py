@@ -1,21 +1,62 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime
-from core.models.loan import Loan
-from shared.file_manager import FileManager
+from core.models.loan import Loan, partition_month
+from core.models.loan_table import LoanTable
+from shared.storage import open_storage
+from shared.partitioned_storage import PartitionedStorage
+from shared.indexes import KeyIndex, GroupIndex, CounterIndex
 from core.controllers.base_controller import BaseController
 from shared.helpers import handle_errors
 
 class LoansController(BaseController[Loan]):
-    def __init__(self) -> None:
-        super().__init__(FileManager(
-            filename='data/loans.csv',
+    def __init__(self, backend: Optional[str] = None) -> None:
+        super().__init__(open_storage(
+            name='loans',
             headers=['ISBN', 'UserID', 'LoanDate', 'ReturnDate'],
-            model_class=Loan
+            model_class=Loan,
+            hot_indexes={
+                'active_ISBN': KeyIndex(field='ISBN', match={'ReturnDate': ''}),
+                'active_UserID': GroupIndex(field='UserID', match={'ReturnDate': ''})
+            },
+            indexes={
+                'by_ISBN': CounterIndex(field='ISBN'),
+                'by_UserID': CounterIndex(field='UserID'),
+                'by_status': CounterIndex(lambda loan: 'completed' if loan.ReturnDate else 'active'),
+                'table': LoanTable()
+            },
+            primary_key=('ISBN', 'UserID', 'LoanDate'),
+            journaled=True,
+            indexed_columns=[('ISBN', 'ReturnDate'), ('UserID', 'ReturnDate'), ('ReturnDate',)],
+            backend=backend,
+            partition_by=partition_month
         ))
+        self.active = self.file_manager.hot if isinstance(self.file_manager, PartitionedStorage) else self.file_manager
 
     @handle_errors
     def list_active(self) -> List[Loan]:
-        return [loan for loan in self.list_all() if not loan.ReturnDate]
+        return sorted(self.active.indexed_values('active_UserID'), key=lambda loan: loan.LoanStamp)
+
+    @handle_errors
+    def list_active_by_user(self, user_id: str) -> List[Loan]:
+        return self.active.lookup_all('active_UserID', user_id)
+
+    @handle_errors
+    def get_active_loan(self, isbn: str | int, user_id: str) -> Optional[Loan]:
+        loan = self.active.lookup('active_ISBN', isbn)
+        return loan if loan and loan.UserID == user_id else None
+
+    @handle_errors
+    def loan_table(self) -> LoanTable:
+        return self.file_manager.get_index('table')
+
+    @handle_errors
+    def window_table(self, start: datetime) -> LoanTable:
+        if self.active is self.file_manager:
+            return self.loan_table()
+
+        table = LoanTable()
+        table.build(self.file_manager.iter_partitions(start.strftime("%Y-%m")))
+        return table
 
     @handle_errors
     def list_returned(self) -> List[Loan]:
@@ -23,8 +64,7 @@ class LoansController(BaseController[Loan]):
 
     @handle_errors
     def is_isbn_loaned(self, isbn: str | int) -> bool:
-        isbn = str(isbn)
-        return any(str(loan.ISBN) == isbn for loan in self.list_active())
+        return self.active.lookup('active_ISBN', isbn) is not None
 
     @handle_errors
     def register_loan(self, isbn: str | int, user_id: str) -> None:
@@ -37,10 +77,7 @@ class LoansController(BaseController[Loan]):
 
     @handle_errors
     def is_loan_late(self, isbn: str | int, user_id: str) -> bool:
-        isbn = str(isbn)
-        loans = self.list_all()
-
-        loan = next((loan for loan in loans if str(loan.ISBN) == isbn and loan.UserID == user_id and not loan.ReturnDate), None)
+        loan = self.get_active_loan(isbn, user_id)
         
         if loan:
             return (datetime.now() - loan.LoanDate).days > 30
@@ -49,14 +86,10 @@ class LoansController(BaseController[Loan]):
 
     @handle_errors
     def register_return(self, isbn: str | int, user_id: str) -> bool:
-        isbn = str(isbn)
-        loans = self.list_all()
-
-        loan = next((loan for loan in loans if str(loan.ISBN) == isbn and loan.UserID == user_id and not loan.ReturnDate), None)
+        loan = self.get_active_loan(isbn, user_id)
         
         if loan:
-            loan.ReturnDate = datetime.now()
-            self.update_all(loans)
+            self.file_manager.upsert_data(loan.returned())
             return True
 
         return False
@@ -0,0 +1,66 @@
+from typing import Dict, Optional
+from core.controllers.books_controller import BooksController
+from core.controllers.users_controller import UsersController
+from core.controllers.loans_controller import LoansController
+from core.models.loan import Loan, partition_month
+from shared.file_manager import FileManager
+from shared.partitioned_storage import PartitionedStorage
+from shared.sqlite_manager import SQLiteManager
+from shared.logger import Logger
+from shared import config
+
+class StorageController:
+    def migrate_csv_to_sqlite(self, overwrite: bool = False) -> Dict[str, int]:
+        migrated: Dict[str, int] = {}
+
+        for name, controller_class in (('books', BooksController), ('users', UsersController), ('loans', LoansController)):
+            source = controller_class(backend='csv').file_manager
+            target = controller_class(backend='sqlite').file_manager
+
+            if isinstance(target, SQLiteManager) and not target.is_empty() and not overwrite:
+                raise ValueError(f"A tabela '{name}' já contém dados; use overwrite=True para substituí-los.")
+
+            items = source.load_data()
+            target.update_data(items)
+            migrated[name] = len(items)
+            Logger.info(f"Migrated {len(items)} rows from {source.location} to {target.location}")
+
+        return migrated
+
+    def partition_loans(self, overwrite: bool = False) -> Dict[str, int]:
+        headers = ['ISBN', 'UserID', 'LoanDate', 'ReturnDate']
+        source = FileManager(
+            filename=f"{config.DATA_DIR}/loans.csv",
+            headers=headers,
+            model_class=Loan,
+            primary_key=('ISBN', 'UserID', 'LoanDate'),
+            journal_filename=f"{config.DATA_DIR}/loans_journal.csv"
+        )
+        target = PartitionedStorage(
+            directory=f"{config.DATA_DIR}/loans",
+            headers=headers,
+            model_class=Loan,
+            partition_by=partition_month,
+            primary_key=('ISBN', 'UserID', 'LoanDate')
+        )
+
+        if target.partition_names() and not overwrite:
+            raise ValueError("O histórico de empréstimos já está particionado; use overwrite=True para refazê-lo.")
+
+        items = source.load_data()
+        target.update_data(items)
+
+        partitions: Dict[str, int] = {}
+        for item in items:
+            name = partition_month(item.to_dict()) or 'open'
+            partitions[name] = partitions.get(name, 0) + 1
+
+        Logger.info(f"Partitioned {len(items)} loans from {source.location} into {target.location}")
+        return dict(sorted(partitions.items()))
+
+    def archive_loans(self, before: Optional[str] = None, codec: str = "gzip") -> Dict[str, int]:
+        storage = LoansController().file_manager
+        if not isinstance(storage, PartitionedStorage):
+            raise ValueError("O arquivamento exige o histórico de empréstimos particionado (BIBLIOTECA_PARTITIONED=1).")
+
+        return storage.archive(before=before, codec=codec)
\ No newline at end of file
@@ -1,53 +1,118 @@
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Set
 import re
 from core.models.user import User
-from shared.file_manager import FileManager
+from shared.storage import open_storage
+from shared.indexes import KeyIndex, CounterIndex, TrigramIndex, PrefixIndex, FuzzyIndex, normalize_email
 from core.controllers.base_controller import BaseController
 
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
 class UsersController(BaseController[User]):
-    def __init__(self) -> None:
-        super().__init__(FileManager(
-            filename='data/users.csv',
+    def __init__(self, backend: Optional[str] = None) -> None:
+        super().__init__(open_storage(
+            name='users',
             headers=['Name', 'Email', 'ID', 'Type'],
-            model_class=User
+            model_class=User,
+            indexes={
+                'ID': KeyIndex(field='ID', normalize=str.strip),
+                'Email': KeyIndex(field='Email', normalize=normalize_email),
+                'by_Type': CounterIndex(field='Type'),
+                'trigrams': TrigramIndex(['Name', 'Email', 'Type', 'ID']),
+                'completions': PrefixIndex(['Name', 'ID']),
+                'fuzzy': FuzzyIndex(['Name', 'Email'])
+            },
+            primary_key=('ID',),
+            backend=backend
         ))
 
     def search_term(self, term: str) -> List[User]:
-        term_lower = term.lower()
-        return [
-            user for user in self.list_all()
-            if any(term_lower in getattr(user, attr).lower() for attr in ['Name', 'Email', 'Type', 'ID'])
-        ]
+        return self.find_all_by('trigrams', term)
+
+    def search_fuzzy(self, term: str, limit: int = 20) -> List[User]:
+        return self.find_all_by('fuzzy', term)[:limit]
+
+    def autocomplete(self, prefix: str, limit: int = 8) -> List[str]:
+        return self.complete('completions', prefix, limit)
+
+    def suggest_users(self, prefix: str, limit: int = 8) -> List[User]:
+        return self.suggest('completions', prefix, limit)
 
     def get_user_by_id(self, user_id: str) -> User:
-        user = next((user for user in self.list_all() if str(user.ID).strip() == user_id.strip()), None)
+        user = self.find_by('ID', user_id)
         if not user:
             raise ValueError("Usuário não encontrado!")
         return user
 
     def register_user(self, user_data: Dict[str, str]) -> None:
+        self.add(self._build_user(user_data, self._stored_key_error))
+
+    def register_users(self, users_data: List[Dict[str, str]]) -> int:
+        claim = self.key_claimer()
+        users: List[User] = []
+        errors: List[str] = []
+
+        for position, user_data in enumerate(users_data, 1):
+            try:
+                users.append(self._build_user(user_data, claim))
+            except ValueError as e:
+                errors.append(f"Registro {position}: {e}")
+
+        if errors:
+            raise ValueError("\n".join(errors))
+
+        self.add_many(users)
+        return len(users)
+
+    def key_claimer(self) -> Callable[[Dict[str, str]], Optional[str]]:
+        known_emails: Set[str] = set()
+        known_ids: Set[str] = set()
+        for row in self.file_manager.iter_data(fields=['Email', 'ID']):
+            known_emails.add(normalize_email(row['Email']))
+            known_ids.add(row['ID'].strip())
+
+        def claim(user_data: Dict[str, str]) -> Optional[str]:
+            email, user_id = normalize_email(user_data['Email']), user_data['ID'].strip()
+            if email in known_emails:
+                return "Email já cadastrado!"
+            elif user_id in known_ids:
+                return "ID já cadastrado!"
+
+            known_emails.add(email)
+            known_ids.add(user_id)
+            return None
+
+        return claim
+
+    def _stored_key_error(self, user_data: Dict[str, str]) -> Optional[str]:
+        if self.email_exists(user_data['Email']):
+            return "Email já cadastrado!"
+        elif self.id_exists(user_data['ID']):
+            return "ID já cadastrado!"
+        return None
+
+    def _build_user(self, user_data: Dict[str, str], key_error: Callable[[Dict[str, str]], Optional[str]]) -> User:
         required_fields = ["Name", "Email", "ID", "Type"]
         missing_fields = [field for field in required_fields if not user_data.get(field)]
 
         if missing_fields:
             raise ValueError("Todos os campos são obrigatórios!")
-        elif self.email_exists(user_data["Email"]):
-            raise ValueError("Email já cadastrado!")
-        elif self.id_exists(user_data["ID"]):
-            raise ValueError("ID já cadastrado!")
-        elif not re.match(r"[^@]+@[^@]+\.[^@]+", user_data["Email"]):
+        elif not EMAIL_PATTERN.match(user_data["Email"]):
             raise ValueError("Email inválido!")
-        
-        self.add(User(**user_data))
+
+        error = key_error(user_data)
+        if error:
+            raise ValueError(error)
+
+        return User(**user_data)
 
     def delete_user(self, user_id: str) -> None:
-        user_to_remove = next((user for user in self.list_all() if str(user.ID).strip() == user_id.strip()), None)
+        user_to_remove = self.find_by('ID', user_id)
         if not user_to_remove:
             raise ValueError("Usuário não encontrado!")
         self.remove(user_to_remove)
 
     def email_exists(self, email: str) -> bool:
-        return any(user.Email == email for user in self.list_all())
+        return self.file_manager.exists('Email', 'Email', email)
 
     def id_exists(self, user_id: str) -> bool:
-        return any(user.ID == user_id for user in self.list_all())
\ No newline at end of file
+        return self.file_manager.exists('ID', 'ID', user_id)
\ No newline at end of file
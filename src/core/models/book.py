@@ -1,7 +1,8 @@
+import sys
 from dataclasses import dataclass
 from typing import Dict, Any
 
-@dataclass
+@dataclass(slots=True)
 class Book:
     Title: str
     Author: str
@@ -9,6 +10,11 @@ class Book:
     ISBN: str
     Category: str
 
+    def __post_init__(self) -> None:
+        self.Year = sys.intern(self.Year)
+        self.ISBN = sys.intern(self.ISBN)
+        self.Category = sys.intern(self.Category)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'Title': self.Title,
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+@dataclass
+class ImportResult:
+    accepted: int = 0
+    rejected: int = 0
+    rejects_path: Optional[Path] = None
\ No newline at end of file
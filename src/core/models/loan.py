@@ -1,30 +1,130 @@
-from dataclasses import dataclass, field
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
-@dataclass
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+LEGACY_DATE_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+
+def to_stamp(date: datetime) -> int:
+    if date.tzinfo is not None:
+        date = date.astimezone().replace(tzinfo=None)
+    return (date - EPOCH) // MICROSECOND
+
+def from_stamp(stamp: int) -> datetime:
+    return EPOCH + timedelta(microseconds=stamp)
+
+def format_stamp(stamp: int) -> str:
+    return from_stamp(stamp).isoformat(sep=" ", timespec="microseconds")
+
+def parse_stamp(text: str) -> int:
+    if len(text) == 26:
+        try:
+            return (datetime.fromisoformat(text) - EPOCH) // MICROSECOND
+        except ValueError:
+            pass
+
+    return parse_legacy_stamp(text)
+
+@lru_cache(maxsize=4096)
+def parse_legacy_stamp(text: str) -> int:
+    try:
+        return to_stamp(datetime.fromisoformat(text))
+    except ValueError:
+        pass
+
+    for date_format in LEGACY_DATE_FORMATS:
+        try:
+            return to_stamp(datetime.strptime(text, date_format))
+        except ValueError:
+            continue
+
+    raise ValueError(f"Unrecognized date format: {text!r}")
+
+def parse_loan_date(text: str) -> datetime:
+    return from_stamp(parse_stamp(text)) if text else datetime.now()
+
+def parse_return_date(text: str) -> Optional[datetime]:
+    return from_stamp(parse_stamp(text)) if text else None
+
+def partition_month(row: Dict[str, Any]) -> Optional[str]:
+    text = row.get('ReturnDate')
+    if not text:
+        return None
+    return text[:7] if len(text) == 26 else from_stamp(parse_stamp(text)).strftime("%Y-%m")
+
 class Loan:
-    ISBN: str
-    UserID: str
-    LoanDate: datetime = field(default_factory=datetime.now)
-    ReturnDate: Optional[datetime] = None
+    __slots__ = ('ISBN', 'UserID', 'LoanStamp', 'ReturnStamp')
+
+    FIELD_PARSERS = {'LoanDate': parse_loan_date, 'ReturnDate': parse_return_date}
+
+    def __init__(
+        self,
+        ISBN: str,
+        UserID: str,
+        LoanDate: Optional[datetime] = None,
+        ReturnDate: Optional[datetime] = None
+    ) -> None:
+        self.ISBN: str = sys.intern(ISBN)
+        self.UserID: str = sys.intern(UserID)
+        self.LoanStamp: int = to_stamp(LoanDate or datetime.now())
+        self.ReturnStamp: Optional[int] = to_stamp(ReturnDate) if ReturnDate else None
+
+    @property
+    def LoanDate(self) -> datetime:
+        return from_stamp(self.LoanStamp)
+
+    @LoanDate.setter
+    def LoanDate(self, value: datetime) -> None:
+        self.LoanStamp = to_stamp(value)
+
+    @property
+    def ReturnDate(self) -> Optional[datetime]:
+        return from_stamp(self.ReturnStamp) if self.ReturnStamp is not None else None
+
+    @ReturnDate.setter
+    def ReturnDate(self, value: Optional[datetime]) -> None:
+        self.ReturnStamp = to_stamp(value) if value else None
+
+    @classmethod
+    def from_stamps(cls, ISBN: str, UserID: str, LoanStamp: int, ReturnStamp: Optional[int] = None) -> 'Loan':
+        loan = cls.__new__(cls)
+        loan.ISBN = sys.intern(ISBN)
+        loan.UserID = sys.intern(UserID)
+        loan.LoanStamp = LoanStamp
+        loan.ReturnStamp = ReturnStamp
+        return loan
+
+    def returned(self, return_date: Optional[datetime] = None) -> 'Loan':
+        return Loan.from_stamps(self.ISBN, self.UserID, self.LoanStamp, to_stamp(return_date or datetime.now()))
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.ISBN, self.UserID, self.LoanStamp, self.ReturnStamp) == (other.ISBN, other.UserID, other.LoanStamp, other.ReturnStamp)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Loan(ISBN={self.ISBN!r}, UserID={self.UserID!r}, LoanDate={self.LoanDate!r}, ReturnDate={self.ReturnDate!r})"
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             'ISBN': self.ISBN,
             'UserID': self.UserID,
-            'LoanDate': self.LoanDate.strftime("%Y-%m-%d %H:%M:%S.%f") if self.LoanDate else '',
-            'ReturnDate': self.ReturnDate.strftime("%Y-%m-%d %H:%M:%S.%f") if self.ReturnDate else ''
+            'LoanDate': format_stamp(self.LoanStamp),
+            'ReturnDate': format_stamp(self.ReturnStamp) if self.ReturnStamp is not None else ''
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Loan':
-        loan_date = datetime.strptime(data['LoanDate'], "%Y-%m-%d %H:%M:%S.%f") if data.get('LoanDate') else datetime.now()
-        return_date = datetime.strptime(data['ReturnDate'], "%Y-%m-%d %H:%M:%S.%f") if data.get('ReturnDate') else None
-        
-        return cls(
-            ISBN=data['ISBN'],
-            UserID=data['UserID'],
-            LoanDate=loan_date,
-            ReturnDate=return_date
+        loan_date = data.get('LoanDate')
+        return_date = data.get('ReturnDate')
+
+        return cls.from_stamps(
+            data['ISBN'],
+            data['UserID'],
+            parse_stamp(loan_date) if loan_date else to_stamp(datetime.now()),
+            parse_stamp(return_date) if return_date else None
         )
\ No newline at end of file
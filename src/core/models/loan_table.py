@@ -0,0 +1,113 @@
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from itertools import compress
+from typing import Dict, List, Optional, Tuple
+from core.models.loan import Loan, EPOCH
+from shared.indexes import Index
+
+DAY = 86_400_000_000
+NO_RETURN = -(2 ** 63)
+
+class LoanTable(Index[Loan]):
+    lazy: bool = True
+
+    def __init__(self) -> None:
+        super().__init__(lambda loan: loan)
+
+    def clear(self) -> None:
+        self.isbns: List[str] = []
+        self.user_ids: List[str] = []
+        self._isbn_codes: Dict[str, int] = {}
+        self._user_codes: Dict[str, int] = {}
+        self.isbn = array('l')
+        self.user = array('l')
+        self.loaned = array('q')
+        self.returned = array('q')
+        self.live = array('b')
+        self._rows: Dict[int, int] = {}
+        self._user_rows: Dict[int, List[int]] = {}
+        self._isbn_counts = array('q')
+        self._user_counts = array('q')
+        self._loans_per_day: Counter = Counter()
+        self._returns_per_day: Counter = Counter()
+        self._total_days: int = 0
+        self._completed: int = 0
+
+    @staticmethod
+    def _encode(value: str, values: List[str], codes: Dict[str, int], counts: array) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+            counts.append(0)
+        return code
+
+    def _tally(self, row: int, step: int) -> None:
+        self._isbn_counts[self.isbn[row]] += step
+        self._user_counts[self.user[row]] += step
+        self._loans_per_day[self.loaned[row] // DAY] += step
+        if self.returned[row] != NO_RETURN:
+            self._returns_per_day[self.returned[row] // DAY] += step
+            self._total_days += step * ((self.returned[row] - self.loaned[row]) // DAY)
+            self._completed += step
+
+    def add(self, loan: Loan) -> None:
+        row = len(self.live)
+        user = self._encode(loan.UserID, self.user_ids, self._user_codes, self._user_counts)
+        self._rows[id(loan)] = row
+        self._user_rows.setdefault(user, []).append(row)
+        self.isbn.append(self._encode(loan.ISBN, self.isbns, self._isbn_codes, self._isbn_counts))
+        self.user.append(user)
+        self.loaned.append(loan.LoanStamp)
+        self.returned.append(NO_RETURN if loan.ReturnStamp is None else loan.ReturnStamp)
+        self.live.append(1)
+        self._tally(row, 1)
+
+    def discard(self, loan: Loan) -> None:
+        row = self._rows.pop(id(loan), None)
+        if row is not None:
+            self.live[row] = 0
+            self._tally(row, -1)
+
+    @staticmethod
+    def to_date(day: int) -> date:
+        return EPOCH.date() + timedelta(days=day)
+
+    @staticmethod
+    def to_day(value: date) -> int:
+        return (value - EPOCH.date()).days
+
+    def rows(self, user_id: Optional[str] = None) -> List[int]:
+        if user_id is None:
+            return list(compress(range(len(self.live)), self.live))
+
+        code = self._user_codes.get(user_id)
+        return [row for row in self._user_rows.get(code, []) if self.live[row]]
+
+    def count_by_isbn(self, rows: Optional[List[int]] = None) -> Dict[str, int]:
+        if rows is None:
+            return {self.isbns[code]: count for code, count in enumerate(self._isbn_counts) if count}
+        return {self.isbns[code]: count for code, count in Counter(self.isbn[row] for row in rows).items()}
+
+    def count_by_user(self) -> Dict[str, int]:
+        return {self.user_ids[code]: count for code, count in enumerate(self._user_counts) if count}
+
+    def daily_counts(self, first_day: int, last_day: int) -> Tuple[Counter, Counter]:
+        days = range(first_day, last_day + 1)
+        loans = Counter({day: self._loans_per_day[day] for day in days if self._loans_per_day.get(day)})
+        returns = Counter({day: self._returns_per_day[day] for day in days if self._returns_per_day.get(day)})
+        return loans, returns
+
+    def loan_days(self, rows: Optional[List[int]] = None) -> Tuple[int, int]:
+        if rows is None:
+            return self._total_days, self._completed
+
+        durations = [
+            (self.returned[row] - self.loaned[row]) // DAY
+            for row in rows if self.returned[row] != NO_RETURN
+        ]
+        return sum(durations), len(durations)
+
+    def __len__(self) -> int:
+        return len(self._rows)
\ No newline at end of file
@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Tuple
+
+@dataclass
+class CountTable:
+    counts: Dict[str, int] = field(default_factory=dict)
+    total: int = 0
+    percentages: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, int]) -> 'CountTable':
+        total = sum(counts.values())
+        return cls(
+            counts=counts,
+            total=total,
+            percentages={key: (count / total) * 100 if total else 0.0 for key, count in counts.items()}
+        )
+
+    def rows(self) -> List[Tuple[str, int, float]]:
+        return [(key, count, self.percentages[key]) for key, count in self.counts.items()]
+
+
+@dataclass
+class StatisticsSnapshot:
+    categories: CountTable
+    user_types: CountTable
+    top_books: List[Tuple[str, str, int, str]]
+    summary: Dict[str, Any]
@@ -1,9 +1,10 @@
+import sys
 from dataclasses import dataclass
 from typing import Dict, Any, Literal, ClassVar
 
 UserType = Literal['Estudante', 'Professor', 'Visitante']
 
-@dataclass
+@dataclass(slots=True)
 class User:
     ALLOWED_TYPES: ClassVar[tuple[UserType, ...]] = ('Estudante', 'Professor', 'Visitante')
     
@@ -16,6 +17,9 @@ class User:
         if self.Type not in self.ALLOWED_TYPES:
             raise ValueError(f"Tipo inválido, o tipo deve ser um dos tipos válidos: {self.ALLOWED_TYPES}")
 
+        self.ID = sys.intern(self.ID)
+        self.Type = sys.intern(self.Type)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             'Name': self.Name,
@@ -1,8 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Callable
+from typing import Any, List, Optional, Callable, Tuple
 from shared.helpers import handle_errors
+from shared.components import AutocompleteEntry
 
 class BaseView(ABC):
     BUTTON_WIDTH = 25
@@ -62,6 +63,16 @@ class BaseView(ABC):
         kwargs.setdefault("width", 40)
         return tk.Entry(parent, **kwargs)
 
+    @handle_errors
+    def create_autocomplete_entry(
+        self,
+        parent: tk.Widget,
+        provider: Callable[[str], List[Tuple[str, str]]],
+        **kwargs: Any
+    ) -> AutocompleteEntry:
+        kwargs.setdefault("width", 40)
+        return AutocompleteEntry(parent, provider, **kwargs)
+
     @handle_errors
     def create_button(
         self,
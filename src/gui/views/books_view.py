@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import tkinter as tk
 from tkinter import ttk, messagebox
 from core.models.book import Book
@@ -197,8 +197,10 @@ class BooksView(BaseView):
         search_container = self.create_frame(search_frame, bg=ColorPalette.SURFACE)
         search_container.pack(fill=tk.X)
 
-        self.entry_busca = self.create_entry(
+        self.entry_busca = self.create_autocomplete_entry(
             search_container,
+            self.book_suggestions,
+            on_select=lambda _: self.search_book(),
             font=Fonts.BODY,
             highlightcolor=ColorPalette.PRIMARY
         )
@@ -377,9 +379,12 @@ class BooksView(BaseView):
     @handle_errors
     def search_book(self) -> None:
         term = self.entry_busca.get()
-        results = self.controller.search_term(term)
+        results = self.controller.search_term(term) or self.controller.search_fuzzy(term)
         self.show_results(results)
 
+    def book_suggestions(self, prefix: str) -> List[Tuple[str, str]]:
+        return [(text, text) for text in self.controller.autocomplete(prefix)]
+
     @handle_errors
     def load_books(self) -> None:
         try:
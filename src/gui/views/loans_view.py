@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
 from core.models.loan import Loan
@@ -315,14 +315,14 @@ class LoansView(BaseView):
 
     @handle_errors
     def new_loan(self) -> None:
-        isbn = self.get_input("Novo Empréstimo", "Digite o ISBN do livro:")
+        isbn = self.resolve_book(self.get_input("Novo Empréstimo", "Digite o ISBN, título ou autor do livro:", self.book_suggestions))
         if not isbn:
             return
 
         if not self.validate_book(isbn):
             return
 
-        user_id = self.get_input("Novo Empréstimo", "Digite o ID do usuário:")
+        user_id = self.resolve_user(self.get_input("Novo Empréstimo", "Digite o ID ou nome do usuário:", self.user_suggestions))
         if not user_id:
             return
 
@@ -332,9 +332,100 @@ class LoansView(BaseView):
         self.confirm_and_register_loan(isbn, user_id)
 
     @handle_errors
-    def get_input(self, title: str, prompt: str) -> Optional[str]:
-        value = simpledialog.askstring(title, prompt, parent=self.root)
-        return value.strip() if value else None
+    def get_input(
+        self,
+        title: str,
+        prompt: str,
+        provider: Optional[Callable[[str], List[Tuple[str, str]]]] = None
+    ) -> Optional[str]:
+        if provider is None:
+            value = simpledialog.askstring(title, prompt, parent=self.root)
+            return value.strip() if value else None
+
+        dialog = tk.Toplevel(self.root, bg=ColorPalette.SURFACE, padx=15, pady=15)
+        dialog.title(title)
+        dialog.transient(self.root)
+        dialog.resizable(False, False)
+        result: Dict[str, str] = {}
+
+        self.create_label(
+            dialog,
+            text=prompt,
+            font=Fonts.BODY,
+            fg=ColorPalette.TEXT_PRIMARY,
+            bg=ColorPalette.SURFACE
+        ).pack(anchor=tk.W, pady=(0, 5))
+
+        entry = self.create_autocomplete_entry(dialog, provider, font=Fonts.BODY)
+        entry.pack(fill=tk.X)
+
+        def confirm(_: Optional[tk.Event] = None) -> None:
+            result["value"] = entry.get().strip()
+            dialog.destroy()
+
+        btn_frame = tk.Frame(dialog, bg=ColorPalette.SURFACE)
+        btn_frame.pack(fill=tk.X, pady=(10, 0))
+
+        self.create_button(
+            btn_frame,
+            text="OK",
+            command=confirm,
+            bg=ColorPalette.PRIMARY,
+            fg=ColorPalette.BUTTON_TEXT,
+            font=Fonts.BUTTON,
+            width=10
+        ).pack(side=tk.RIGHT, padx=5)
+
+        self.create_button(
+            btn_frame,
+            text="Cancelar",
+            command=dialog.destroy,
+            bg=ColorPalette.LIGHT,
+            fg=ColorPalette.TEXT_PRIMARY,
+            font=Fonts.BUTTON,
+            width=10
+        ).pack(side=tk.RIGHT, padx=5)
+
+        entry.bind("<Return>", confirm, add="+")
+        entry.focus_set()
+        dialog.grab_set()
+        self.root.wait_window(dialog)
+
+        return result.get("value") or None
+
+    def book_suggestions(self, prefix: str) -> List[Tuple[str, str]]:
+        return [
+            (f"{book.Title} — {book.Author} ({book.ISBN})", book.ISBN)
+            for book in self.books_controller.suggest_books(prefix)
+        ]
+
+    def user_suggestions(self, prefix: str) -> List[Tuple[str, str]]:
+        return [
+            (f"{user.Name} ({user.ID})", user.ID)
+            for user in self.users_controller.suggest_users(prefix)
+        ]
+
+    def resolve_book(self, text: Optional[str]) -> Optional[str]:
+        if not text or self.books_controller.isbn_exists(text):
+            return text
+
+        matches = self.books_controller.suggest_books(text, limit=2)
+        if len(matches) == 1:
+            return matches[0].ISBN
+
+        self.show_error("Mais de um livro corresponde ao texto; escolha um na lista de sugestões." if matches else "Livro não encontrado no sistema!")
+        return None
+
+    def resolve_user(self, text: Optional[str]) -> Optional[str]:
+        if not text or self.users_controller.id_exists(text):
+            return text
+
+        matches = self.users_controller.suggest_users(text, limit=2)
+        if len(matches) == 1:
+            return matches[0].ID
+
+        self.show_error("Mais de um usuário corresponde ao texto; escolha um na lista de sugestões." if matches else "Usuário não encontrado!")
+        return None
 
     @handle_errors
     def validate_book(self, isbn: str) -> bool:
@@ -17,6 +17,7 @@ class StatisticsView(BaseView):
         self.summary_widgets: Dict[str, tk.Label] = {}
         self.limit_var = tk.IntVar(value=10)
         self.cards_frame = None
+        self.snapshot = self.controller.snapshot(limit=self.limit_var.get())
         self.clear_frame()
         self._setup_window()
         self._create_main_container()
@@ -80,8 +81,7 @@ class StatisticsView(BaseView):
         self.category_tree.pack(expand=True, fill=tk.BOTH)
 
         chart_frame = self._create_chart_frame(content_frame)
-        data = self.controller.books_by_category()
-        bar = NativeBarChart(data, "Livros por Categoria").create_tk_chart(chart_frame)
+        bar = NativeBarChart(self.snapshot.categories.counts, "Livros por Categoria").create_tk_chart(chart_frame)
         bar.pack(expand=True, fill=tk.BOTH)
 
     def _create_user_type_tab(self) -> None:
@@ -94,8 +94,7 @@ class StatisticsView(BaseView):
         self.user_type_tree.pack(expand=True, fill=tk.BOTH)
 
         chart_frame = self._create_chart_frame(content_frame, pady=10)
-        data = self.controller.loans_by_user_type()
-        pie = NativePieChart(data, "Empréstimos por Tipo de Usuário").create_tk_chart(chart_frame)
+        pie = NativePieChart(self.snapshot.user_types.counts, "Empréstimos por Tipo de Usuário").create_tk_chart(chart_frame)
         pie.pack(expand=True, fill=tk.BOTH)
 
     def _create_top_books_tab(self) -> None:
@@ -220,26 +219,30 @@ class StatisticsView(BaseView):
                         bg=ColorPalette.BACKGROUND).pack()
 
     def _load_data(self) -> None:
-        self._load_table_data(self.category_tree, self.controller.books_by_category(), 
-                            lambda x: (x[0], x[1], f"{(x[1]/sum(self.controller.books_by_category().values()))*100:.1f}%"))
+        self._load_table_data(self.category_tree, self.snapshot.categories.rows(),
+                            lambda x: (x[0], x[1], f"{x[2]:.1f}%"))
         
-        self._load_table_data(self.user_type_tree, self.controller.loans_by_user_type(),
-                            lambda x: (x[0], x[1], f"{(x[1]/sum(self.controller.loans_by_user_type().values()))*100:.1f}%"))
+        self._load_table_data(self.user_type_tree, self.snapshot.user_types.rows(),
+                            lambda x: (x[0], x[1], f"{x[2]:.1f}%"))
         
-        self._update_top_books()
+        self._load_top_books()
 
-    def _load_table_data(self, tree: ttk.Treeview, data: Dict[str, int], formatter: callable) -> None:
+    def _load_table_data(self, tree: ttk.Treeview, data: List[Tuple], formatter: callable) -> None:
         tree.delete(*tree.get_children())
-        for item in data.items():
+        for item in data:
             tree.insert("", "end", values=formatter(item))
 
-    def _update_top_books(self) -> None:
+    def _load_top_books(self) -> None:
         self._load_table_data(self.top_books_tree, 
-                            dict(enumerate(self.controller.most_loaned_books(limit=self.limit_var.get()), 1)),
+                            list(enumerate(self.snapshot.top_books, 1)),
                             lambda x: (x[0], x[1][0], x[1][1], x[1][2], x[1][3]))
 
+    def _update_top_books(self) -> None:
+        self.snapshot.top_books = self.controller.most_loaned_books(limit=self.limit_var.get())
+        self._load_top_books()
+
     def update_summary_data(self) -> None:
-        stats = self.controller.get_summary_stats()
+        stats = self.snapshot.summary
         for key, label in self.summary_widgets.items():
             value = stats.get(key, 0)
             label.config(text=f"{value:.1f}" if isinstance(value, float) else str(value))
@@ -255,7 +258,7 @@ class StatisticsView(BaseView):
                          [(u.ID, u.Name, u.Email, u.Type) for u in self.controller.users.list_all()])
 
     def _show_active_loans(self) -> None:
-        loans = [loan for loan in self.controller.loans.list_all() if not loan.ReturnDate]
+        loans = self.controller.loans.list_active()
         books = {b.ISBN: b.Title for b in self.controller.books.list_all()}
         users = {u.ID: u.Name for u in self.controller.users.list_all()}
         
@@ -265,7 +268,7 @@ class StatisticsView(BaseView):
                           for i, l in enumerate(loans)])
 
     def _show_completed_loans(self) -> None:
-        loans = [loan for loan in self.controller.loans.list_all() if loan.ReturnDate]
+        loans = self.controller.loans.list_returned()
         books = {b.ISBN: b.Title for b in self.controller.books.list_all()}
         users = {u.ID: u.Name for u in self.controller.users.list_all()}
         
@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import tkinter as tk
 from tkinter import ttk, messagebox
 from core.models.user import User
@@ -205,8 +205,10 @@ class UsersView(BaseView):
         search_container = self.create_frame(search_frame, bg=ColorPalette.SURFACE)
         search_container.pack(fill=tk.X)
 
-        self.entry_search = self.create_entry(
+        self.entry_search = self.create_autocomplete_entry(
             search_container,
+            self.user_suggestions,
+            on_select=lambda _: self.search_user(),
             font=Fonts.BODY,
             highlightcolor=ColorPalette.PRIMARY
         )
@@ -396,7 +398,7 @@ class UsersView(BaseView):
             return
             
         try:
-            results = self.controller.search_term(term)
+            results = self.controller.search_term(term) or self.controller.search_fuzzy(term)
             if not results:
                 self.show_info("Nenhum usuário encontrado")
             self.show_results(results)
@@ -404,6 +406,9 @@ class UsersView(BaseView):
             Logger.error(f"Error searching users: {str(e)}")
             self.show_error("Erro na busca de usuários")
 
+    def user_suggestions(self, prefix: str) -> List[Tuple[str, str]]:
+        return [(text, text) for text in self.controller.autocomplete(prefix)]
+
     @handle_errors
     def load_users(self) -> None:
         try:
@@ -1,4 +1,5 @@
 from typing import List, Dict, Tuple, Union, Optional, Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from reportlab.lib import colors
@@ -21,6 +22,7 @@ from reportlab.graphics.charts.piecharts import Pie
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from shared.logger import Logger
 from shared.style import ColorPalette, Fonts
 import tkinter as tk
 import math
@@ -72,6 +74,156 @@ class Card(tk.Frame):
             label.bind("<Button-1>", lambda e: command())
         return label
 
+class AutocompleteEntry(tk.Entry):
+    POLL_MS: int = 30
+    _executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autocomplete")
+
+    def __init__(
+        self,
+        parent: tk.Widget,
+        provider: Callable[[str], List[Tuple[str, str]]],
+        on_select: Optional[Callable[[str], None]] = None,
+        delay: int = 150,
+        max_rows: int = 8,
+        **kwargs
+    ) -> None:
+        super().__init__(parent, **kwargs)
+        self.provider = provider
+        self.on_select = on_select
+        self.delay = delay
+        self.max_rows = max_rows
+        self._pending: Optional[str] = None
+        self._request: Optional[Tuple[str, Future]] = None
+        self._popup: Optional[tk.Toplevel] = None
+        self._listbox: Optional[tk.Listbox] = None
+        self._values: List[str] = []
+
+        self.bind("<KeyRelease>", self._on_key_release, add="+")
+        self.bind("<Down>", self._focus_suggestions, add="+")
+        self.bind("<Escape>", lambda _: self.hide_suggestions(), add="+")
+        self.bind("<FocusOut>", lambda _: self.after(200, self._hide_if_unfocused), add="+")
+        self.bind("<Destroy>", lambda _: self.hide_suggestions(), add="+")
+
+    def _on_key_release(self, event: tk.Event) -> None:
+        if event.keysym in ("Down", "Up", "Return", "Escape", "Tab"):
+            return
+
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.delay, self._refresh)
+
+    def _refresh(self) -> None:
+        self._pending = None
+        prefix = self.get().strip()
+        if not prefix:
+            self.hide_suggestions()
+            return
+
+        self._request = (prefix, self._executor.submit(self.provider, prefix))
+        self._poll()
+
+    def _poll(self) -> None:
+        self._pending = None
+        if self._request is None:
+            return
+
+        prefix, future = self._request
+        if not future.done():
+            self._pending = self.after(self.POLL_MS, self._poll)
+            return
+
+        self._request = None
+        if prefix != self.get().strip():
+            return
+
+        try:
+            suggestions = future.result()
+        except Exception as e:
+            Logger.error(f"Error fetching suggestions for '{prefix}': {e}")
+            suggestions = []
+
+        if suggestions:
+            self.show_suggestions(suggestions)
+        else:
+            self.hide_suggestions()
+
+    def show_suggestions(self, suggestions: List[Tuple[str, str]]) -> None:
+        if self._popup is None:
+            self._popup = tk.Toplevel(self)
+            self._popup.overrideredirect(True)
+            self._listbox = tk.Listbox(
+                self._popup,
+                font=self.cget("font"),
+                bg=ColorPalette.SURFACE,
+                fg=ColorPalette.TEXT_PRIMARY,
+                selectbackground=ColorPalette.PRIMARY,
+                activestyle="none",
+                exportselection=False
+            )
+            self._listbox.pack(expand=True, fill=tk.BOTH)
+            self._listbox.bind("<ButtonRelease-1>", self._select_current)
+            self._listbox.bind("<Return>", self._select_current)
+            self._listbox.bind("<Escape>", lambda _: self._close_and_focus())
+            self._listbox.bind("<Up>", self._on_listbox_up)
+
+        self._values = [value for _, value in suggestions]
+        self._listbox.delete(0, tk.END)
+        for label, _ in suggestions:
+            self._listbox.insert(tk.END, label)
+        self._listbox.configure(height=min(len(suggestions), self.max_rows))
+
+        self.update_idletasks()
+        self._popup.geometry(f"{self.winfo_width()}x{self._listbox.winfo_reqheight()}+{self.winfo_rootx()}+{self.winfo_rooty() + self.winfo_height()}")
+        self._popup.deiconify()
+        self._popup.lift()
+
+    def hide_suggestions(self) -> None:
+        self._request = None
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        if self._popup is not None:
+            self._popup.destroy()
+            self._popup = None
+            self._listbox = None
+
+    def _hide_if_unfocused(self) -> None:
+        if self._listbox is None or self.focus_get() not in (self, self._listbox):
+            self.hide_suggestions()
+
+    def _close_and_focus(self) -> None:
+        self.hide_suggestions()
+        self.focus_set()
+
+    def _focus_suggestions(self, _: tk.Event) -> str:
+        if self._listbox is not None and self._values:
+            self._listbox.focus_set()
+            self._listbox.selection_clear(0, tk.END)
+            self._listbox.selection_set(0)
+            self._listbox.activate(0)
+        return "break"
+
+    def _on_listbox_up(self, _: tk.Event) -> Optional[str]:
+        if self._listbox.curselection() == (0,):
+            self.focus_set()
+            return "break"
+        return None
+
+    def _select_current(self, _: tk.Event) -> str:
+        selection = self._listbox.curselection() if self._listbox is not None else ()
+        if not selection:
+            return "break"
+
+        value = self._values[selection[0]]
+        self.delete(0, tk.END)
+        self.insert(0, value)
+        self._close_and_focus()
+        self.icursor(tk.END)
+        if self.on_select:
+            self.on_select(value)
+        return "break"
+
+
 class NativePieChart:
     COLORS: List[str] = [
         ColorPalette.PRIMARY,
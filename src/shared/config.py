@@ -0,0 +1,11 @@
+import os
+
+DATA_DIR: str = os.getenv("BIBLIOTECA_DATA_DIR", "data")
+STORAGE_BACKEND: str = os.getenv("BIBLIOTECA_STORAGE", "csv")
+SQLITE_FILENAME: str = os.getenv("BIBLIOTECA_SQLITE_FILE", "library.db")
+DURABILITY: str = os.getenv("BIBLIOTECA_DURABILITY", "fsync")
+GROUP_COMMIT_MS: int = int(os.getenv("BIBLIOTECA_GROUP_COMMIT_MS", "50"))
+WRITE_BUFFER_MS: int = int(os.getenv("BIBLIOTECA_WRITE_BUFFER_MS", "0"))
+WRITE_BUFFER_ROWS: int = int(os.getenv("BIBLIOTECA_WRITE_BUFFER_ROWS", "500"))
+LOCK_TIMEOUT: float = float(os.getenv("BIBLIOTECA_LOCK_TIMEOUT", "10"))
+PARTITIONED_STORAGE: bool = os.getenv("BIBLIOTECA_PARTITIONED", "0") == "1"
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+from shared.logger import Logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class FileLock:
+    _registry: Dict[Path, "FileLock"] = {}
+    _registry_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self._mutex: threading.RLock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._depth: int = 0
+        self._exclusive: bool = False
+
+    @classmethod
+    def for_path(cls, path: Path) -> "FileLock":
+        key = path.resolve()
+        with cls._registry_lock:
+            if key not in cls._registry:
+                cls._registry[key] = cls(key)
+            return cls._registry[key]
+
+    @contextmanager
+    def hold(self, exclusive: bool, timeout: float) -> Iterator[None]:
+        deadline = time.monotonic() + timeout
+        if not self._mutex.acquire(timeout=timeout):
+            self._timeout(exclusive)
+
+        try:
+            if self._depth == 0 or (exclusive and not self._exclusive):
+                self._acquire(exclusive, deadline)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._release()
+        finally:
+            self._mutex.release()
+
+    def _acquire(self, exclusive: bool, deadline: float) -> None:
+        if fcntl is not None:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+
+            operation = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB
+            delay = 0.001
+            while True:
+                try:
+                    fcntl.flock(self._fd, operation)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        self._timeout(exclusive)
+                    time.sleep(delay)
+                    delay = min(delay * 2, 0.05)
+
+        self._exclusive = exclusive
+
+    def _release(self) -> None:
+        if fcntl is not None and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._exclusive = False
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        cls._registry_lock = threading.Lock()
+        for lock in cls._registry.values():
+            if lock._fd is not None:
+                os.close(lock._fd)
+            lock._fd = None
+            lock._mutex = threading.RLock()
+            lock._depth = 0
+            lock._exclusive = False
+
+    def _timeout(self, exclusive: bool) -> None:
+        kind = "exclusive" if exclusive else "shared"
+        Logger.error(f"Timed out waiting for {kind} lock on {self.path}")
+        raise TimeoutError(f"Timed out waiting for {kind} lock on {self.path}")
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=FileLock._reset_after_fork)
\ No newline at end of file
@@ -1,72 +1,377 @@
+import atexit
+import codecs
 import csv
-from typing import List, Dict, Any, TypeVar, Generic, Type
+import gzip
+import lzma
+import os
+import shutil
+import sys
+import threading
+import weakref
+from contextlib import ExitStack, contextmanager
+from typing import List, Dict, Any, Type, Optional, Tuple, Iterator, Iterable, Set, TextIO, BinaryIO, ContextManager
 from pathlib import Path
-from abc import ABC, abstractmethod
+from shared.file_lock import FileLock
 from shared.logger import Logger
+from shared.indexes import Index
+from shared.storage import BaseModel, Storage, T, RowKey
 
-T = TypeVar("T", bound="BaseModel")
+FileSignature = Tuple[int, int, int]
+Snapshot = Dict[Path, Tuple[BinaryIO, int]]
+
+DURABILITY_MODES = ("fsync", "group")
+ARCHIVE_CODECS = {".gz": gzip, ".xz": lzma}
+WRITE_BUFFER_SIZE = 1 << 20
+
+_pending_managers: "weakref.WeakSet[FileManager[Any]]" = weakref.WeakSet()
+
+__all__ = ["BaseModel", "FileManager"]
+
+class WriteBuffer:
+    _registry: Dict[Path, "WriteBuffer"] = {}
+    _registry_lock: threading.Lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.rows: Dict[Path, List[Dict[str, Any]]] = {}
+        self.count: int = 0
+        self.generation: int = 0
+        self.lock: threading.RLock = threading.RLock()
+        self.timer: Optional[threading.Timer] = None
 
-class BaseModel(ABC):
     @classmethod
-    @abstractmethod
-    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T: ...
+    def for_path(cls, path: Path) -> "WriteBuffer":
+        key = path.resolve()
+        with cls._registry_lock:
+            if key not in cls._registry:
+                cls._registry[key] = cls()
+            return cls._registry[key]
 
-    @abstractmethod
-    def to_dict(self) -> Dict[str, Any]: ...
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        cls._registry_lock = threading.Lock()
+        for buffer in cls._registry.values():
+            buffer.rows = {}
+            buffer.count = 0
+            buffer.lock = threading.RLock()
+            buffer.timer = None
 
+class FileManager(Storage[T]):
+    def __init__(
+        self,
+        filename: str,
+        headers: List[str],
+        model_class: Type[T],
+        indexes: Optional[Dict[str, Index[T]]] = None,
+        primary_key: Optional[Tuple[str, ...]] = None,
+        journal_filename: Optional[str] = None,
+        compact_threshold: int = 1000,
+        durability: str = "fsync",
+        lock_timeout: float = 10.0,
+        group_commit_ms: int = 50,
+        write_buffer_ms: int = 0,
+        write_buffer_rows: int = 500
+    ) -> None:
+        super().__init__(headers, model_class, indexes, primary_key)
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability mode: {durability}")
 
-class FileManager(Generic[T]):
-    def __init__(self, filename: str, headers: List[str], model_class: Type[T]) -> None:
         self.filename: Path = Path(filename)
-        self.headers: List[str] = headers
-        self.model_class: Type[T] = model_class
-        self._create_file_if_not_exists()
+        self.journal: Optional[Path] = Path(journal_filename) if journal_filename else None
+        self.compact_threshold: int = compact_threshold
+        self.durability: str = durability
+        self.lock_timeout: float = lock_timeout
+        self._file_lock: FileLock = FileLock.for_path(self.filename.with_name(f"{self.filename.name.split('.')[0]}.lock"))
+        self.group_commit_ms: int = group_commit_ms
+        self.write_buffer_ms: int = write_buffer_ms
+        self.write_buffer_rows: int = write_buffer_rows
+        self._journal_rows: int = 0
+        self._buffer: WriteBuffer = WriteBuffer.for_path(self.filename)
+        self._unsynced: Set[Path] = set()
+        self._sync_lock: threading.Lock = threading.Lock()
+        self._sync_timer: Optional[threading.Timer] = None
+        self._create_file_if_not_exists(self.filename)
+        if self.journal:
+            self._create_file_if_not_exists(self.journal)
+
+    @property
+    def location(self) -> str:
+        return str(self.filename)
+
+    @property
+    def counters_path(self) -> Path:
+        return self.filename.with_name(f"{self.filename.stem}.counters.json")
 
-    def _create_file_if_not_exists(self) -> None:
+    def _transaction(self) -> ContextManager[None]:
+        return self._file_lock.hold(exclusive=True, timeout=self.lock_timeout)
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[Snapshot]:
+        with ExitStack() as stack:
+            snapshot: Snapshot = {}
+            with self._file_lock.hold(exclusive=False, timeout=self.lock_timeout):
+                for filename in filter(None, (self.filename, self.journal)):
+                    codec = ARCHIVE_CODECS.get(filename.suffix)
+                    try:
+                        handle = stack.enter_context(codec.open(filename, "rb") if codec else filename.open("rb"))
+                    except FileNotFoundError:
+                        continue
+                    snapshot[filename] = (handle, sys.maxsize if codec else os.fstat(handle.fileno()).st_size)
+            yield snapshot
+
+    def _create_file_if_not_exists(self, filename: Path) -> None:
         try:
-            if not self.filename.exists():
-                self.filename.parent.mkdir(parents=True, exist_ok=True)
-                with self.filename.open("w", newline="", encoding="utf-8-sig") as file:
-                    writer = csv.DictWriter(file, fieldnames=self.headers)
-                    writer.writeheader()
+            if not filename.exists():
+                filename.parent.mkdir(parents=True, exist_ok=True)
+                with self._transaction():
+                    if not filename.exists():
+                        self._reset_file(filename)
         except Exception as e:
-            Logger.error(f"Error creating file {self.filename}: {e}")
+            Logger.error(f"Error creating file {filename}: {e}")
             raise
 
-    def add_data(self, data: T) -> None:
+    def _reset_file(self, filename: Path) -> None:
+        self._replace_file(filename, [])
+
+    def _replace_file(self, filename: Path, rows: Iterable[Dict[str, Any]]) -> None:
+        temp_name = filename.with_name(f".{filename.name}.{os.getpid()}.{threading.get_ident()}.tmp")
         try:
-            with self.filename.open("a", newline="", encoding="utf-8-sig") as file:
+            with temp_name.open("w", newline="", encoding="utf-8-sig", buffering=WRITE_BUFFER_SIZE) as file:
                 writer = csv.DictWriter(file, fieldnames=self.headers)
-                writer.writerow(data.to_dict())
-        except Exception as e:
-            Logger.error(f"Error adding data to {self.filename}: {e}")
+                writer.writeheader()
+                writer.writerows(rows)
+                file.flush()
+                os.fsync(file.fileno())
+
+            if filename.exists():
+                shutil.copymode(filename, temp_name)
+            os.replace(temp_name, filename)
+        except BaseException:
+            temp_name.unlink(missing_ok=True)
             raise
 
-    def load_data(self) -> List[T]:
-        items: List[T] = []
+        with self._sync_lock:
+            self._unsynced.discard(filename)
+        self._sync_directory(filename.parent)
+
+    @staticmethod
+    def _sync_directory(directory: Path) -> None:
+        if os.name == "nt":
+            return
+
+        fd = os.open(directory, os.O_RDONLY)
         try:
-            if self.filename.exists():
-                with self.filename.open("r", encoding="utf-8-sig") as file:
-                    reader = csv.DictReader(file)
-                    for row in reader:
-                        try:
-                            item = self.model_class.from_dict(row)
-                            items.append(item)
-                        except Exception as parse_error:
-                            Logger.error(f"Error parsing row {row}: {parse_error}")
-            
-            return items
-        except Exception as e:
-            Logger.error(f"Error loading data from {self.filename}: {e}")
-            raise
+            os.fsync(fd)
+        except OSError as e:
+            Logger.warning(f"Could not sync directory {directory}: {e}")
+        finally:
+            os.close(fd)
+
+    def _commit(self, filename: Path, file: TextIO) -> None:
+        file.flush()
+        if self.durability == "fsync":
+            os.fsync(file.fileno())
+            return
+
+        with self._sync_lock:
+            self._unsynced.add(filename)
+            if self._sync_timer is None:
+                self._sync_timer = threading.Timer(self.group_commit_ms / 1000, self.sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+        _pending_managers.add(self)
 
-    def update_data(self, new_data: List[T]) -> None:
+    def sync(self) -> None:
+        with self._sync_lock:
+            pending, self._unsynced = self._unsynced, set()
+            if self._sync_timer is not None:
+                self._sync_timer.cancel()
+                self._sync_timer = None
+
+        for filename in pending:
+            try:
+                fd = os.open(filename, os.O_RDWR)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                Logger.error(f"Error syncing {filename}: {e}")
+
+    def _file_signature(self, filename: Path) -> Optional[FileSignature]:
         try:
-            with self.filename.open("w", newline="", encoding="utf-8-sig") as file:
-                writer = csv.DictWriter(file, fieldnames=self.headers)
-                writer.writeheader()
-                for item in new_data:
-                    writer.writerow(item.to_dict())
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _current_signature(self) -> Tuple[Any, ...]:
+        return self._durable_signature() + (self._buffer.generation,)
+
+    def _durable_signature(self) -> Tuple[Optional[FileSignature], ...]:
+        if self.journal:
+            return (self._file_signature(self.filename), self._file_signature(self.journal))
+        return (self._file_signature(self.filename),)
+
+    def _append_rows(self, filename: Path, rows: List[Dict[str, Any]]) -> None:
+        if not self.write_buffer_ms:
+            self._write_rows(filename, rows)
+            return
+
+        buffer = self._buffer
+        with self._transaction(), buffer.lock:
+            buffer.rows.setdefault(filename, []).extend(rows)
+            buffer.count += len(rows)
+            buffer.generation += 1
+            if buffer.count >= self.write_buffer_rows:
+                self.flush_writes()
+            elif buffer.timer is None:
+                buffer.timer = threading.Timer(self.write_buffer_ms / 1000, self._flush_in_background)
+                buffer.timer.daemon = True
+                buffer.timer.start()
+                _pending_managers.add(self)
+
+    def flush_writes(self) -> None:
+        buffer = self._buffer
+        if not buffer.rows:
+            return
+
+        with self._transaction(), buffer.lock:
+            if buffer.timer is not None:
+                buffer.timer.cancel()
+                buffer.timer = None
+            if not buffer.rows:
+                return
+
+            signature = self._current_signature()
+            while buffer.rows:
+                filename, rows = next(iter(buffer.rows.items()))
+                self._write_rows(filename, rows)
+                del buffer.rows[filename]
+                buffer.count -= len(rows)
+
+            if self._signature == signature:
+                self._signature = self._current_signature()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush_writes()
         except Exception as e:
-            Logger.error(f"Error updating data in {self.filename}: {e}")
-            raise
+            Logger.error(f"Error flushing buffered writes to {self.location}: {e}")
+
+    def _write_rows(self, filename: Path, rows: List[Dict[str, Any]]) -> None:
+        with self._transaction(), filename.open("a", newline="", encoding="utf-8-sig") as file:
+            writer = csv.DictWriter(file, fieldnames=self.headers)
+            writer.writerows(rows)
+            self._commit(filename, file)
+
+    def _write_append(self, rows: List[Dict[str, Any]]) -> None:
+        self._append_rows(self.filename, rows)
+
+    def _write_upsert(self, row: Dict[str, Any], data: T) -> None:
+        if self.journal:
+            self._append_rows(self.journal, [row])
+            self._journal_rows += 1
+            return
+
+        items = list(self._ensure_loaded())
+        position = self._positions.get(self._row_key(row))
+        if position is None:
+            items.append(data)
+        else:
+            items[position] = data
+        self._write_file(items)
+
+    def _after_upsert(self) -> None:
+        if self.journal and self._journal_rows >= self.compact_threshold:
+            self.compact()
+
+    def _write_remove(self, row: Dict[str, Any], remaining: List[T]) -> None:
+        self._write_file(remaining)
+
+    def _write_all(self, items: List[T]) -> None:
+        self._write_file(items)
+
+    def compact(self) -> None:
+        if not self.journal:
+            return
+
+        with self._lock, self._transaction():
+            self.update_data(self.load_data())
+        Logger.info(f"Compacted journal {self.journal} into {self.filename}")
+
+    def _read_csv(self, snapshot: Snapshot, filename: Path) -> Iterator[Dict[str, Any]]:
+        if filename not in snapshot:
+            return
+
+        handle, size = snapshot[filename]
+        yield from csv.DictReader(codecs.iterdecode(self._bounded_lines(handle, size), "utf-8-sig"))
+
+    @staticmethod
+    def _bounded_lines(handle: BinaryIO, size: int) -> Iterator[bytes]:
+        for line in handle:
+            if size <= 0:
+                return
+            yield line[:size]
+            size -= len(line)
+
+    def _read_rows(self, snapshot: Snapshot, filename: Path) -> List[Tuple[Dict[str, Any], T]]:
+        rows: List[Tuple[Dict[str, Any], T]] = []
+        for row in self._read_csv(snapshot, filename):
+            try:
+                item = self.model_class.from_dict(row)
+                rows.append((row, item))
+            except Exception as parse_error:
+                Logger.error(f"Error parsing row {row}: {parse_error}")
+
+        return rows
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        self.flush_writes()
+        with self._snapshot() as snapshot:
+            overrides: Dict[RowKey, Dict[str, Any]] = {}
+            if self.journal and self.primary_key:
+                overrides = {self._row_key(row): row for row in self._read_csv(snapshot, self.journal)}
+
+            for row in self._read_csv(snapshot, self.filename):
+                yield overrides.pop(self._row_key(row), row) if overrides else row
+
+            yield from overrides.values()
+
+    def _read_all(self) -> Tuple[List[T], Dict[RowKey, int]]:
+        self.flush_writes()
+        with self._snapshot() as snapshot:
+            rows = self._read_rows(snapshot, self.filename)
+            items = [item for _, item in rows]
+            positions: Dict[RowKey, int] = {}
+            self._journal_rows = 0
+
+            if self.primary_key:
+                positions = {self._row_key(row): position for position, (row, _) in enumerate(rows)}
+
+            if self.journal and self.primary_key:
+                for row, item in self._read_rows(snapshot, self.journal):
+                    self._apply_upsert(items, positions, self._row_key(row), item)
+                    self._journal_rows += 1
+
+        return items, positions
+
+    def _write_file(self, new_data: List[T]) -> None:
+        with self._transaction():
+            self.flush_writes()
+            self._replace_file(self.filename, (item.to_dict() for item in new_data))
+
+            if self.journal:
+                self._reset_file(self.journal)
+                self._journal_rows = 0
+
+
+@atexit.register
+def _sync_pending_writes() -> None:
+    for manager in list(_pending_managers):
+        manager.flush_writes()
+        manager.sync()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=WriteBuffer._reset_after_fork)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Any, Callable, TypeVar, cast, List
+from typing import Any, Callable, Optional, TypeVar, cast, List
 from shared.logger import Logger
 import functools
+import unicodedata
 
 FuncType = TypeVar("FuncType", bound=Callable[..., Any])
 
@@ -11,6 +12,31 @@ def format_date(date: datetime) -> str:
     except Exception:
         return str(date)
 
+def fold_text(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def edit_distance(source: str, target: str, limit: Optional[int] = None) -> int:
+    if len(source) < len(target):
+        source, target = target, source
+    if limit is not None and len(source) - len(target) > limit:
+        return limit + 1
+
+    previous = list(range(len(target) + 1))
+    for i, source_char in enumerate(source, 1):
+        current = [i]
+        for j, target_char in enumerate(target, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (source_char != target_char)
+            ))
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous = current
+
+    return previous[-1]
+
 def handle_errors(func: FuncType) -> FuncType:
     @functools.wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
@@ -0,0 +1,416 @@
+import re
+import heapq
+from bisect import bisect_left, insort
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, Tuple, TypeVar
+from shared.helpers import edit_distance, fold_text
+
+T = TypeVar("T")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: str) -> Set[str]:
+    return set(TOKEN_PATTERN.findall(fold_text(text)))
+
+def identity(value: str) -> str:
+    return value
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+class Index(ABC, Generic[T]):
+    lazy: bool = False
+
+    def __init__(
+        self,
+        key: Optional[Callable[[T], Any]] = None,
+        normalize: Optional[Callable[[str], str]] = None,
+        where: Optional[Callable[[T], bool]] = None,
+        field: Optional[str] = None,
+        match: Optional[Dict[str, str]] = None
+    ) -> None:
+        if key is None and field is None:
+            raise ValueError(f"{type(self).__name__} needs a key function or a field name")
+
+        self.field: Optional[str] = field
+        self.key: Callable[[T], Any] = key or (lambda item: getattr(item, field))
+        self.normalize: Callable[[str], str] = normalize or identity
+        self.where: Optional[Callable[[T], bool]] = where
+        self.match: Dict[str, str] = match or {}
+        self.clear()
+
+    def _key_of(self, item: T) -> str:
+        return self.normalize(str(self.key(item)))
+
+    def _accepts(self, item: T) -> bool:
+        if self.where is not None and not self.where(item):
+            return False
+        return all(str(getattr(item, column) or "") == value for column, value in self.match.items())
+
+    def build(self, items: Iterable[T]) -> None:
+        self.clear()
+        for item in items:
+            self.add(item)
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def add(self, item: T) -> None: ...
+
+    @abstractmethod
+    def discard(self, item: T) -> None: ...
+
+
+class KeyIndex(Index[T]):
+    def clear(self) -> None:
+        self._entries: Dict[str, T] = {}
+
+    def add(self, item: T) -> None:
+        if self._accepts(item):
+            self._entries.setdefault(self._key_of(item), item)
+
+    def discard(self, item: T) -> None:
+        key = self._key_of(item)
+        if self._entries.get(key) is item:
+            del self._entries[key]
+
+    def get(self, key: Any) -> Optional[T]:
+        return self._entries.get(self.normalize(str(key)))
+
+    def values(self) -> List[T]:
+        return list(self._entries.values())
+
+    def __contains__(self, key: Any) -> bool:
+        return self.normalize(str(key)) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class GroupIndex(Index[T]):
+    def clear(self) -> None:
+        self._groups: Dict[str, Dict[int, T]] = {}
+
+    def add(self, item: T) -> None:
+        if self._accepts(item):
+            self._groups.setdefault(self._key_of(item), {})[id(item)] = item
+
+    def discard(self, item: T) -> None:
+        key = self._key_of(item)
+        group = self._groups.get(key)
+        if group is not None and group.pop(id(item), None) is not None and not group:
+            del self._groups[key]
+
+    def get(self, key: Any) -> List[T]:
+        return list(self._groups.get(self.normalize(str(key)), {}).values())
+
+    def values(self) -> List[T]:
+        return [item for group in self._groups.values() for item in group.values()]
+
+    def __contains__(self, key: Any) -> bool:
+        return self.normalize(str(key)) in self._groups
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+
+class CounterIndex(Index[T]):
+    def clear(self) -> None:
+        self._counts: Dict[str, int] = {}
+
+    def add(self, item: T) -> None:
+        if self._accepts(item):
+            key = self._key_of(item)
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def discard(self, item: T) -> None:
+        if self._accepts(item):
+            key = self._key_of(item)
+            count = self._counts.get(key, 0) - 1
+            if count > 0:
+                self._counts[key] = count
+            else:
+                self._counts.pop(key, None)
+
+    def get(self, key: Any) -> int:
+        return self._counts.get(self.normalize(str(key)), 0)
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+class TrigramIndex(Index[T]):
+    lazy: bool = True
+
+    def __init__(self, fields: List[str], where: Optional[Callable[[T], bool]] = None) -> None:
+        self.fields: List[str] = fields
+        super().__init__(lambda item: item, where=where)
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _values_of(self, item: T) -> List[str]:
+        return [fold_text(str(getattr(item, field))) for field in self.fields]
+
+    def clear(self) -> None:
+        self._items: Dict[int, T] = {}
+        self._postings: Dict[str, Dict[int, T]] = {}
+
+    def add(self, item: T) -> None:
+        if not self._accepts(item):
+            return
+
+        self._items[id(item)] = item
+        for value in self._values_of(item):
+            for trigram in self.trigrams(value):
+                self._postings.setdefault(trigram, {})[id(item)] = item
+
+    def discard(self, item: T) -> None:
+        if self._items.pop(id(item), None) is None:
+            return
+
+        for value in self._values_of(item):
+            for trigram in self.trigrams(value):
+                posting = self._postings.get(trigram)
+                if posting is not None and posting.pop(id(item), None) is not None and not posting:
+                    del self._postings[trigram]
+
+    def _matches(self, item: T, words: List[str]) -> bool:
+        values = self._values_of(item)
+        return all(any(word in value for value in values) for word in words)
+
+    def get(self, term: Any) -> List[T]:
+        words = fold_text(str(term)).split()
+        trigrams = set().union(*(self.trigrams(word) for word in words))
+
+        if trigrams:
+            postings = sorted((self._postings.get(trigram, {}) for trigram in trigrams), key=len)
+            smallest, others = postings[0], postings[1:]
+            candidates = [item for key, item in smallest.items() if all(key in posting for posting in others)]
+        else:
+            candidates = list(self._items.values())
+
+        return [item for item in candidates if self._matches(item, words)]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class PrefixIndex(Index[T]):
+    lazy: bool = True
+    RANKED_PREFIX_LENGTH: int = 3
+
+    def __init__(self, fields: List[str], where: Optional[Callable[[T], bool]] = None, top_k: int = 50) -> None:
+        self.fields: List[str] = fields
+        self.top_k: int = top_k
+        super().__init__(lambda item: item, where=where)
+
+    @staticmethod
+    def _keys_for(display: str) -> List[str]:
+        folded = fold_text(display).strip()
+        words = folded.split()
+        return [" ".join(words[start:]) for start in range(len(words))] or [folded]
+
+    def _prefixes_of(self, display: str) -> Set[str]:
+        return {
+            key[:length]
+            for key in self._keys_for(display)
+            for length in range(1, min(len(key), self.RANKED_PREFIX_LENGTH) + 1)
+        }
+
+    def _displays_of(self, item: T) -> Set[str]:
+        return {str(getattr(item, field)).strip() for field in self.fields} - {""}
+
+    def _score(self, display: str) -> Tuple[int, int, str]:
+        return (-len(self._entries[display]), len(display), display)
+
+    def clear(self) -> None:
+        self._entries: Dict[str, Dict[int, T]] = {}
+        self._keys: List[Tuple[str, str]] = []
+        self._ranked: Dict[str, List[str]] = {}
+
+    def build(self, items: Iterable[T]) -> None:
+        self.clear()
+        for item in items:
+            if self._accepts(item):
+                for display in self._displays_of(item):
+                    self._entries.setdefault(display, {})[id(item)] = item
+        self._keys = sorted((key, display) for display in self._entries for key in self._keys_for(display))
+
+    def add(self, item: T) -> None:
+        if not self._accepts(item):
+            return
+
+        for display in self._displays_of(item):
+            entry = self._entries.setdefault(display, {})
+            if not entry:
+                for key in self._keys_for(display):
+                    insort(self._keys, (key, display))
+            entry[id(item)] = item
+            self._promote(display)
+
+    def discard(self, item: T) -> None:
+        for display in self._displays_of(item):
+            entry = self._entries.get(display)
+            if entry is None or entry.pop(id(item), None) is None:
+                continue
+
+            self._demote(display)
+            if entry:
+                continue
+
+            del self._entries[display]
+            for key in self._keys_for(display):
+                position = bisect_left(self._keys, (key, display))
+                if position < len(self._keys) and self._keys[position] == (key, display):
+                    del self._keys[position]
+
+    def _promote(self, display: str) -> None:
+        for prefix in self._prefixes_of(display):
+            ranked = self._ranked.get(prefix)
+            if ranked is None:
+                continue
+
+            if display in ranked:
+                ranked.remove(display)
+            position = bisect_left([self._score(other) for other in ranked], self._score(display))
+            ranked.insert(position, display)
+            del ranked[self.top_k:]
+
+    def _demote(self, display: str) -> None:
+        for prefix in self._prefixes_of(display):
+            ranked = self._ranked.get(prefix)
+            if ranked is not None and display in ranked:
+                del self._ranked[prefix]
+
+    def _candidates(self, folded: str) -> Set[str]:
+        candidates: Set[str] = set()
+        position = bisect_left(self._keys, (folded, ""))
+        for key, display in self._keys[position:]:
+            if not key.startswith(folded):
+                break
+            candidates.add(display)
+        return candidates
+
+    def _rank(self, folded: str, limit: int) -> List[str]:
+        return heapq.nsmallest(limit, self._candidates(folded), key=self._score)
+
+    def complete(self, prefix: Any, limit: int = 10) -> List[str]:
+        folded = fold_text(str(prefix)).strip()
+        if not folded:
+            return []
+
+        if len(folded) > self.RANKED_PREFIX_LENGTH or limit > self.top_k:
+            return self._rank(folded, limit)
+
+        ranked = self._ranked.get(folded)
+        if ranked is None:
+            ranked = self._ranked[folded] = self._rank(folded, self.top_k)
+        return ranked[:limit]
+
+    def get(self, prefix: Any, limit: int = 10) -> List[T]:
+        matches: Dict[int, T] = {}
+        for display in self.complete(prefix, limit):
+            for key, item in self._entries[display].items():
+                matches.setdefault(key, item)
+                if len(matches) >= limit:
+                    return list(matches.values())
+        return list(matches.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FuzzyIndex(Index[T]):
+    lazy: bool = True
+
+    def __init__(self, fields: List[str], where: Optional[Callable[[T], bool]] = None, max_distance: int = 2) -> None:
+        self.fields: List[str] = fields
+        self.max_distance: int = max_distance
+        super().__init__(lambda item: " ".join(str(getattr(item, field)) for field in fields), where=where)
+
+    @staticmethod
+    def grams(word: str) -> Set[str]:
+        padded = f"$${word}$$"
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def tolerance(self, word: str) -> int:
+        if len(word) <= 3:
+            return 0
+        if len(word) <= 7:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def clear(self) -> None:
+        self._postings: Dict[str, Dict[int, T]] = {}
+        self._words_by_gram: Dict[str, List[str]] = {}
+
+    def add(self, item: T) -> None:
+        if not self._accepts(item):
+            return
+
+        for word in tokenize(self._key_of(item)):
+            posting = self._postings.get(word)
+            if posting is None:
+                posting = self._postings[word] = {}
+                for gram in self.grams(word):
+                    self._words_by_gram.setdefault(gram, []).append(word)
+            posting[id(item)] = item
+
+    def discard(self, item: T) -> None:
+        for word in tokenize(self._key_of(item)):
+            posting = self._postings.get(word)
+            if posting is not None:
+                posting.pop(id(item), None)
+
+    def near(self, word: str, max_distance: int) -> List[Tuple[str, int]]:
+        if max_distance <= 0:
+            return [(word, 0)] if self._postings.get(word) else []
+
+        grams = self.grams(word)
+        threshold = len(grams) - 3 * max_distance
+        if threshold > 0:
+            shared = Counter(candidate for gram in grams for candidate in self._words_by_gram.get(gram, ()))
+            candidates: Iterable[str] = (candidate for candidate, count in shared.items() if count >= threshold)
+        else:
+            candidates = self._postings
+
+        matches: List[Tuple[str, int]] = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance or not self._postings[candidate]:
+                continue
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((candidate, distance))
+        return matches
+
+    def get(self, query: Any, limit: Optional[int] = None) -> List[T]:
+        words = tokenize(str(query))
+        if not words:
+            return []
+
+        scores: Optional[Dict[int, int]] = None
+        items: Dict[int, T] = {}
+        for word in sorted(words, key=len, reverse=True):
+            best: Dict[int, int] = {}
+            for match, distance in self.near(word, self.tolerance(word)):
+                for key, item in self._postings[match].items():
+                    if (scores is None or key in scores) and distance < best.get(key, distance + 1):
+                        items[key] = item
+                        best[key] = distance
+
+            scores = best if scores is None else {key: scores[key] + distance for key, distance in best.items()}
+            if not scores:
+                return []
+
+        ranked = sorted(scores, key=scores.__getitem__)
+        return [items[key] for key in ranked[:limit]]
+
+    def __len__(self) -> int:
+        return sum(1 for posting in self._postings.values() if posting)
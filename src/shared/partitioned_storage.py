@@ -0,0 +1,313 @@
+import csv
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import List, Dict, Any, Type, Optional, Tuple, Iterator, Callable, ContextManager
+from shared.file_lock import FileLock
+from shared.file_manager import FileManager, ARCHIVE_CODECS
+from shared.indexes import Index, CounterIndex
+from shared.logger import Logger
+from shared.storage import Storage, T, RowKey
+
+PARTITION_PATTERN = re.compile(r"^(\d{4}-\d{2})\.csv(\.gz|\.xz)?$")
+HOT_PARTITION = "open"
+ARCHIVE_SUFFIXES = {"gzip": ".gz", "lzma": ".xz"}
+
+class PartitionedStorage(Storage[T]):
+    def __init__(
+        self,
+        directory: str,
+        headers: List[str],
+        model_class: Type[T],
+        partition_by: Callable[[Dict[str, Any]], Optional[str]],
+        indexes: Optional[Dict[str, Index[T]]] = None,
+        hot_indexes: Optional[Dict[str, Index[T]]] = None,
+        primary_key: Optional[Tuple[str, ...]] = None,
+        lock_timeout: float = 10.0,
+        **file_options: Any
+    ) -> None:
+        super().__init__(headers, model_class, indexes, primary_key)
+        self.directory: Path = Path(directory)
+        self.partition_by: Callable[[Dict[str, Any]], Optional[str]] = partition_by
+        self.lock_timeout: float = lock_timeout
+        self.file_options: Dict[str, Any] = file_options
+        self._partitions: Dict[Path, FileManager[T]] = {}
+        self._file_lock: FileLock = FileLock.for_path(self.directory / "partitions.lock")
+        self.hot: FileManager[T] = self._open(HOT_PARTITION, hot_indexes)
+
+    @property
+    def location(self) -> str:
+        return str(self.directory)
+
+    @property
+    def counters_path(self) -> Path:
+        return self.directory / "counters.json"
+
+    def _open(self, name: str, indexes: Optional[Dict[str, Index[T]]] = None) -> FileManager[T]:
+        return self._store(self.directory / f"{name}.csv", indexes)
+
+    def _store(self, filename: Path, indexes: Optional[Dict[str, Index[T]]] = None) -> FileManager[T]:
+        return FileManager(
+            filename=str(filename),
+            headers=self.headers,
+            model_class=self.model_class,
+            indexes=indexes,
+            primary_key=self.primary_key,
+            lock_timeout=self.lock_timeout,
+            **self.file_options
+        )
+
+    def _partition_files(self) -> Dict[str, Path]:
+        files: Dict[str, Path] = {}
+        for entry in os.scandir(self.directory):
+            match = PARTITION_PATTERN.match(entry.name)
+            if match and (match.group(1) not in files or match.group(2)):
+                files[match.group(1)] = Path(entry.path)
+        return files
+
+    def partition_names(self) -> List[str]:
+        return sorted(self._partition_files())
+
+    def _cached_store(self, filename: Path) -> FileManager[T]:
+        if filename not in self._partitions:
+            self._partitions[filename] = self._store(filename)
+        return self._partitions[filename]
+
+    def partition(self, name: str, files: Optional[Dict[str, Path]] = None) -> FileManager[T]:
+        files = self._partition_files() if files is None else files
+        return self._cached_store(files.get(name, self.directory / f"{name}.csv"))
+
+    def _named_partitions(self, first: Optional[str] = None) -> List[Tuple[str, FileManager[T]]]:
+        files = self._partition_files()
+        return [(name, self._cached_store(files[name])) for name in sorted(files) if first is None or name >= first]
+
+    def partitions(self, first: Optional[str] = None) -> List[FileManager[T]]:
+        return [store for _, store in self._named_partitions(first)]
+
+    @staticmethod
+    def is_archived(store: FileManager[T]) -> bool:
+        return store.filename.suffix in ARCHIVE_CODECS
+
+    def _summary_path(self, name: str) -> Path:
+        return self.directory / f"{name}.index.json"
+
+    def archive_summary(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._summary_path(name).open("r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            Logger.warning(f"Ignoring unreadable archive index {self._summary_path(name)}: {e}")
+            return None
+
+    def archive(self, before: Optional[str] = None, codec: str = "gzip") -> Dict[str, int]:
+        if codec not in ARCHIVE_SUFFIXES:
+            raise ValueError(f"Unknown archive codec: {codec}")
+
+        before = before or datetime.now().strftime("%Y-%m")
+        archived: Dict[str, int] = {}
+        with self._transaction():
+            for name, filename in sorted(self._partition_files().items()):
+                if name < before and filename.suffix not in ARCHIVE_CODECS:
+                    archived[name] = self._archive_partition(name, self._cached_store(filename), codec)
+
+        return archived
+
+    def _archive_partition(self, name: str, store: FileManager[T], codec: str) -> int:
+        target = self.directory / f"{name}.csv{ARCHIVE_SUFFIXES[codec]}"
+        temp_name = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        count_fields = sorted({index.field for index in self._counter_indexes().values() if index.field and index.where is None and not index.match})
+        counts: Dict[str, Counter] = {field: Counter() for field in count_fields}
+        ranges: Dict[str, List[str]] = {}
+        rows = 0
+
+        with store._transaction():
+            try:
+                with ARCHIVE_CODECS[target.suffix].open(temp_name, "wt", encoding="utf-8", newline="") as file:
+                    writer = csv.DictWriter(file, fieldnames=self.headers)
+                    writer.writeheader()
+                    for row in store.iter_data(fields=self.headers):
+                        writer.writerow(row)
+                        rows += 1
+                        for field in count_fields:
+                            counts[field][row[field]] += 1
+                        try:
+                            canonical = self.model_class.from_dict(row).to_dict()
+                        except Exception:
+                            canonical = row
+                        for field, value in canonical.items():
+                            if value:
+                                bounds = ranges.setdefault(field, [value, value])
+                                bounds[0], bounds[1] = min(bounds[0], value), max(bounds[1], value)
+
+                fd = os.open(temp_name, os.O_RDWR)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+                os.replace(temp_name, target)
+            except BaseException:
+                temp_name.unlink(missing_ok=True)
+                raise
+
+            summary = {"codec": codec, "rows": rows, "ranges": ranges, "counts": {field: dict(counter) for field, counter in counts.items()}}
+            summary_temp = self._summary_path(name).with_name(f".{name}.index.json.tmp")
+            with summary_temp.open("w", encoding="utf-8") as file:
+                json.dump(summary, file, ensure_ascii=False)
+            os.replace(summary_temp, self._summary_path(name))
+
+            store.filename.unlink()
+            self._partitions.pop(store.filename, None)
+
+        Logger.info(f"Archived partition {name} of {self.location} ({rows} rows, {codec})")
+        return rows
+
+    def _writable(self, store: FileManager[T]) -> FileManager[T]:
+        if not self.is_archived(store):
+            return store
+
+        name = PARTITION_PATTERN.match(store.filename.name).group(1)
+        items = store.load_data()
+        restored = self._open(name)
+        restored.update_data(items)
+        self._partitions[restored.filename] = restored
+        store.filename.unlink()
+        self._summary_path(name).unlink(missing_ok=True)
+        self._partitions.pop(store.filename, None)
+        Logger.info(f"Restored archived partition {name} of {self.location} for writing")
+        return restored
+
+    def _may_overlap(self, name: str, store: FileManager[T], columns: List[str], lower: Optional[str], upper: Optional[str]) -> bool:
+        summary = self.archive_summary(name) if self.is_archived(store) else None
+        if summary is None or "ranges" not in summary:
+            return True
+
+        for column in columns:
+            bounds = summary["ranges"].get(column)
+            if bounds and (lower is None or bounds[1] >= lower) and (upper is None or bounds[0] < upper):
+                return True
+        return False
+
+    def iter_overlapping(
+        self,
+        columns: List[str],
+        lower: Optional[str] = None,
+        upper: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Iterator[Any]:
+        stores = [store for name, store in self._named_partitions() if self._may_overlap(name, store, columns, lower, upper)]
+        for store in chain(stores, [self.hot]):
+            yield from store.iter_data(fields=fields, where=where)
+
+    def iter_partitions(self, first: str) -> Iterator[T]:
+        for store in chain(self.partitions(first), [self.hot]):
+            yield from store.iter_data()
+
+    def _transaction(self) -> ContextManager[None]:
+        return self._file_lock.hold(exclusive=True, timeout=self.lock_timeout)
+
+    def _current_signature(self) -> Tuple[Any, ...]:
+        stores = self._named_partitions() + [(HOT_PARTITION, self.hot)]
+        return tuple((name, store._current_signature()) for name, store in stores)
+
+    def _durable_signature(self) -> Tuple[Any, ...]:
+        return self._current_signature()
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        for store in chain(self.partitions(), [self.hot]):
+            yield from store.iter_data(fields=self.headers)
+
+    def _read_all(self) -> Tuple[List[T], Dict[RowKey, int]]:
+        items: List[T] = []
+        positions: Dict[RowKey, int] = {}
+
+        for row in self._iter_rows():
+            try:
+                item = self.model_class.from_dict(row)
+            except Exception as parse_error:
+                Logger.error(f"Error parsing row {row}: {parse_error}")
+                continue
+
+            if self.primary_key:
+                self._apply_upsert(items, positions, self._row_key(row), item)
+            else:
+                items.append(item)
+
+        return items, positions
+
+    def _count_fallback(self, index_name: str, index: CounterIndex[T]) -> Dict[str, int]:
+        if not index.field or index.where is not None or index.match:
+            return super()._count_fallback(index_name, index)
+
+        counts: Counter = Counter()
+        for name, store in self._named_partitions():
+            summary = self.archive_summary(name) if self.is_archived(store) else None
+            if summary is not None and index.field in summary.get("counts", {}):
+                counts.update(summary["counts"][index.field])
+            else:
+                counts.update(store.count_by(index.field))
+
+        counts.update(self.hot.count_by(index.field))
+        return dict(counts)
+
+    def _store_for(self, row: Dict[str, Any], files: Optional[Dict[str, Path]] = None) -> FileManager[T]:
+        name = self.partition_by(row)
+        if not name:
+            return self.hot
+
+        store = self._writable(self.partition(name, files))
+        if files is not None:
+            files[name] = store.filename
+        return store
+
+    def _locate(self, key: RowKey) -> Optional[Tuple[FileManager[T], T]]:
+        for store in chain([self.hot], reversed(self.partitions())):
+            item = next(store.iter_data(where=lambda row: self._row_key(row) == key), None)
+            if item is not None:
+                return store, item
+        return None
+
+    def _write_append(self, rows: List[Dict[str, Any]]) -> None:
+        groups: Dict[FileManager[T], List[T]] = {}
+        files = self._partition_files()
+        for row in rows:
+            groups.setdefault(self._store_for(row, files), []).append(self.model_class.from_dict(row))
+
+        for store, items in groups.items():
+            store.add_many(items)
+
+    def _write_upsert(self, row: Dict[str, Any], data: T) -> None:
+        found = self._locate(self._row_key(row))
+        if found is not None:
+            found = (self._writable(found[0]), found[1])
+        target = self._store_for(row)
+
+        if found is None:
+            target.add_data(data)
+        elif found[0].filename == target.filename:
+            target.upsert_data(data)
+        else:
+            target.add_data(data)
+            found[0].remove_data(found[1])
+
+    def _write_remove(self, row: Dict[str, Any], remaining: List[T]) -> None:
+        found = self._locate(self._row_key(row))
+        if found is not None:
+            self._writable(found[0]).remove_data(found[1])
+
+    def _write_all(self, items: List[T]) -> None:
+        stores = [self._writable(store) for store in self.partitions()]
+        groups: Dict[FileManager[T], List[T]] = {store: [] for store in chain(stores, [self.hot])}
+        files = self._partition_files()
+        for item in items:
+            groups.setdefault(self._store_for(item.to_dict(), files), []).append(item)
+
+        for store, group in groups.items():
+            store.invalidate()
+            store.update_data(group)
\ No newline at end of file
@@ -0,0 +1,250 @@
+import sqlite3
+from typing import List, Dict, Any, Type, Optional, Tuple, Iterator, Callable
+from pathlib import Path
+from shared.logger import Logger
+from shared.indexes import Index, CounterIndex, KeyIndex, GroupIndex, identity, normalize_email
+from shared.storage import Storage, T, RowKey
+
+SYNCHRONOUS_MODES = {"fsync": "FULL", "group": "NORMAL"}
+SQL_NORMALIZERS: Dict[Callable[[str], str], str] = {identity: "{}", str.strip: "trim({})", normalize_email: "lower(trim({}))"}
+
+class SQLiteManager(Storage[T]):
+    def __init__(
+        self,
+        database: str,
+        table: str,
+        headers: List[str],
+        model_class: Type[T],
+        indexes: Optional[Dict[str, Index[T]]] = None,
+        primary_key: Optional[Tuple[str, ...]] = None,
+        indexed_columns: Optional[List[Tuple[str, ...]]] = None,
+        durability: str = "fsync"
+    ) -> None:
+        super().__init__(headers, model_class, indexes, primary_key)
+        self.database: Path = Path(database)
+        self.table: str = table
+        self.indexed_columns: List[Tuple[str, ...]] = indexed_columns or []
+        self.synchronous: str = SYNCHRONOUS_MODES.get(durability, "")
+        if not self.synchronous:
+            raise ValueError(f"Unknown durability mode: {durability}")
+
+        columns = ", ".join(self._quote(header) for header in headers)
+        placeholders = ", ".join("?" for _ in headers)
+        self._select_sql = f"SELECT {columns} FROM {self._quote(table)} ORDER BY rowid"
+        self._select_where_sql = f"SELECT {columns} FROM {self._quote(table)}{{}} ORDER BY rowid"
+        self._insert_sql = f"INSERT INTO {self._quote(table)} ({columns}) VALUES ({placeholders})"
+        self._delete_all_sql = f"DELETE FROM {self._quote(table)}"
+        self._delete_sql = (
+            f"DELETE FROM {self._quote(table)} WHERE rowid = (SELECT rowid FROM {self._quote(table)} WHERE "
+            + " AND ".join(f"{self._quote(field)} = ?" for field in (primary_key or headers))
+            + " LIMIT 1)"
+        )
+        self._upsert_sql = self._insert_sql
+        if primary_key:
+            conflict = ", ".join(self._quote(field) for field in primary_key)
+            updates = ", ".join(f"{self._quote(header)} = excluded.{self._quote(header)}" for header in headers)
+            self._upsert_sql += f" ON CONFLICT ({conflict}) DO UPDATE SET {updates}"
+
+        self.connection: sqlite3.Connection = self._connect()
+
+    @property
+    def location(self) -> str:
+        return f"{self.database}:{self.table}"
+
+    @property
+    def counters_path(self) -> Path:
+        return self.database.with_name(f"{self.database.stem}.{self.table}.counters.json")
+
+    @staticmethod
+    def _quote(identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.database.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.database, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self.synchronous}")
+
+            columns = ", ".join(f"{self._quote(header)} TEXT NOT NULL DEFAULT ''" for header in self.headers)
+            with connection:
+                connection.execute(f"CREATE TABLE IF NOT EXISTS {self._quote(self.table)} ({columns})")
+                if self.primary_key:
+                    self._create_index(connection, self.primary_key, unique=True)
+                for index_columns in self.indexed_columns:
+                    self._create_index(connection, index_columns)
+                for index_name in self.indexes:
+                    expression = self._key_expression(index_name)
+                    if expression is not None and self.indexes[index_name].normalize is not identity:
+                        name = self._quote(f"idx_{self.table}_{index_name.lower()}_key")
+                        connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {self._quote(self.table)} ({expression})")
+                self._create_version_triggers(connection)
+
+            return connection
+        except Exception as e:
+            Logger.error(f"Error opening database {self.database}: {e}")
+            raise
+
+    def _create_index(self, connection: sqlite3.Connection, columns: Tuple[str, ...], unique: bool = False) -> None:
+        name = self._quote(f"idx_{self.table}_{'_'.join(columns).lower()}")
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        fields = ", ".join(self._quote(column) for column in columns)
+        connection.execute(f"CREATE {kind} IF NOT EXISTS {name} ON {self._quote(self.table)} ({fields})")
+
+    def _create_version_triggers(self, connection: sqlite3.Connection) -> None:
+        connection.execute("CREATE TABLE IF NOT EXISTS storage_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+        connection.execute("INSERT OR IGNORE INTO storage_versions (name, version) VALUES (?, 0)", (self.table,))
+        table_name = self.table.replace("'", "''")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            trigger = self._quote(f"{self.table}_version_{event.lower()}")
+            connection.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON {self._quote(self.table)} BEGIN "
+                f"UPDATE storage_versions SET version = version + 1 WHERE name = '{table_name}'; END"
+            )
+
+    def _current_signature(self) -> int:
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def _durable_signature(self) -> int:
+        return self.connection.execute("SELECT version FROM storage_versions WHERE name = ?", (self.table,)).fetchone()[0]
+
+    def _values(self, row: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(row.get(header) or "") for header in self.headers)
+
+    def _read_all(self) -> Tuple[List[T], Dict[RowKey, int]]:
+        items: List[T] = []
+        positions: Dict[RowKey, int] = {}
+
+        for values in self.connection.execute(self._select_sql):
+            row = dict(zip(self.headers, values))
+            try:
+                item = self.model_class.from_dict(row)
+            except Exception as parse_error:
+                Logger.error(f"Error parsing row {row}: {parse_error}")
+                continue
+
+            if self.primary_key:
+                positions[self._row_key(row)] = len(items)
+            items.append(item)
+
+        return items, positions
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        for values in self.connection.execute(self._select_sql):
+            yield dict(zip(self.headers, values))
+
+    def _write_append(self, rows: List[Dict[str, Any]]) -> None:
+        with self.connection:
+            self.connection.executemany(self._insert_sql, (self._values(row) for row in rows))
+
+    def _write_upsert(self, row: Dict[str, Any], data: T) -> None:
+        with self.connection:
+            self.connection.execute(self._upsert_sql, self._values(row))
+
+    def _write_remove(self, row: Dict[str, Any], remaining: List[T]) -> None:
+        key = self._row_key(row) if self.primary_key else self._values(row)
+        with self.connection:
+            self.connection.execute(self._delete_sql, key)
+
+    def _write_all(self, items: List[T]) -> None:
+        with self.connection:
+            self.connection.execute(self._delete_all_sql)
+            self.connection.executemany(self._upsert_sql, (self._values(item.to_dict()) for item in items))
+
+    def _key_expression(self, index_name: str) -> Optional[str]:
+        index = self.indexes[index_name]
+        template = SQL_NORMALIZERS.get(index.normalize)
+        if not isinstance(index, (KeyIndex, GroupIndex)) or index.field not in self.headers or index.where is not None or template is None:
+            return None
+        return template.format(self._quote(index.field))
+
+    def _index_query(self, index_name: str, key: Optional[Any] = None) -> Optional[Tuple[str, List[str]]]:
+        expression = None if self._is_cache_fresh() else self._key_expression(index_name)
+        if expression is None:
+            return None
+
+        index = self.indexes[index_name]
+        conditions = [f"{self._quote(column)} = ?" for column in index.match]
+        parameters = list(index.match.values())
+        if key is not None:
+            conditions.append(f"{expression} = ?")
+            parameters.append(index.normalize(str(key)))
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def _select(self, where: str, parameters: List[str], limit: Optional[int] = None) -> List[T]:
+        query = self._select_where_sql.format(where) + (f" LIMIT {limit}" if limit else "")
+        items: List[T] = []
+        try:
+            for values in self.connection.execute(query, parameters):
+                row = dict(zip(self.headers, values))
+                try:
+                    items.append(self.model_class.from_dict(row))
+                except Exception as parse_error:
+                    Logger.error(f"Error parsing row {row}: {parse_error}")
+        except Exception as e:
+            Logger.error(f"Error querying {self.location}: {e}")
+            raise
+        return items
+
+    def exists(self, index_name: str, field: str, key: Any) -> bool:
+        with self._lock:
+            query = self._index_query(index_name, key)
+            if query is None:
+                return super().exists(index_name, field, key)
+
+            where, parameters = query
+            sql = f"SELECT 1 FROM {self._quote(self.table)}{where} LIMIT 1"
+            return self.connection.execute(sql, parameters).fetchone() is not None
+
+    def lookup(self, index_name: str, key: Any) -> Optional[T]:
+        with self._lock:
+            query = self._index_query(index_name, key)
+            if query is None or not isinstance(self.indexes[index_name], KeyIndex):
+                return super().lookup(index_name, key)
+
+            items = self._select(*query, limit=1)
+            return items[0] if items else None
+
+    def lookup_all(self, index_name: str, key: Any) -> List[T]:
+        with self._lock:
+            query = self._index_query(index_name, key)
+            if query is None or not isinstance(self.indexes[index_name], GroupIndex):
+                return super().lookup_all(index_name, key)
+
+            return self._select(*query)
+
+    def indexed_values(self, index_name: str) -> List[T]:
+        with self._lock:
+            query = self._index_query(index_name)
+            if query is None:
+                return super().indexed_values(index_name)
+
+            index = self.indexes[index_name]
+            items = self._select(*query)
+            if isinstance(index, GroupIndex):
+                return items
+
+            first: Dict[str, T] = {}
+            for item in items:
+                first.setdefault(index._key_of(item), item)
+            return list(first.values())
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        if field not in self.headers:
+            raise ValueError(f"Unknown column '{field}' in {self.location}")
+
+        column = self._quote(field)
+        query = f"SELECT {column}, COUNT(*) FROM {self._quote(self.table)} GROUP BY {column}"
+        try:
+            return {str(value): count for value, count in self.connection.execute(query)}
+        except Exception as e:
+            Logger.error(f"Error counting {field} in {self.location}: {e}")
+            raise
+
+    def _count_fallback(self, index_name: str, index: CounterIndex[T]) -> Dict[str, int]:
+        if index.field and index.where is None and not index.match:
+            return self.count_by(index.field)
+        return super()._count_fallback(index_name, index)
+
+    def is_empty(self) -> bool:
+        return self.connection.execute(f"SELECT 1 FROM {self._quote(self.table)} LIMIT 1").fetchone() is None
@@ -0,0 +1,507 @@
+import atexit
+import copy
+import json
+import os
+import threading
+import weakref
+from typing import List, Dict, Any, TypeVar, Generic, Type, Optional, Tuple, Iterator, Callable, ContextManager, Set
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import nullcontext
+from pathlib import Path
+from shared.logger import Logger
+from shared.indexes import Index, CounterIndex
+from shared import config
+
+T = TypeVar("T", bound="BaseModel")
+
+RowKey = Tuple[str, ...]
+
+_dirty_storages: "weakref.WeakSet[Storage[Any]]" = weakref.WeakSet()
+
+class BaseModel(ABC):
+    @classmethod
+    @abstractmethod
+    def from_dict(cls: Type[T], data: Dict[str, Any]) -> T: ...
+
+    @abstractmethod
+    def to_dict(self) -> Dict[str, Any]: ...
+
+
+class LazyRecord(Generic[T]):
+    __slots__ = ("_row", "_model_class", "_parsers", "_values", "_model")
+
+    def __init__(self, row: Dict[str, Any], model_class: Type[T], parsers: Optional[Dict[str, Callable[[str], Any]]] = None) -> None:
+        self._row: Dict[str, Any] = row
+        self._model_class: Type[T] = model_class
+        self._parsers: Dict[str, Callable[[str], Any]] = parsers if parsers is not None else getattr(model_class, "FIELD_PARSERS", {})
+        self._values: Optional[Dict[str, Any]] = None
+        self._model: Optional[T] = None
+
+    def __getattr__(self, name: str) -> Any:
+        parser = self._parsers.get(name)
+        if parser is not None:
+            if self._values is None:
+                self._values = {}
+            if name not in self._values:
+                self._values[name] = parser(self._row[name])
+            return self._values[name]
+
+        if name in self._row:
+            return self._row[name]
+
+        return getattr(self.materialize(), name)
+
+    def materialize(self) -> T:
+        if self._model is None:
+            self._model = self._model_class.from_dict(self._row)
+        return self._model
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._row)
+
+
+class Storage(ABC, Generic[T]):
+    def __init__(
+        self,
+        headers: List[str],
+        model_class: Type[T],
+        indexes: Optional[Dict[str, Index[T]]] = None,
+        primary_key: Optional[Tuple[str, ...]] = None
+    ) -> None:
+        self.headers: List[str] = headers
+        self.model_class: Type[T] = model_class
+        self.indexes: Dict[str, Index[T]] = indexes or {}
+        self.primary_key: Optional[Tuple[str, ...]] = primary_key
+        self._cache: Optional[List[T]] = None
+        self._positions: Dict[RowKey, int] = {}
+        self._signature: Optional[Any] = None
+        self._stale_indexes: Set[str] = set()
+        self._lock = threading.RLock()
+        self._persisted_counters: Optional[Tuple[Any, Dict[str, Dict[str, int]]]] = None
+
+    @property
+    @abstractmethod
+    def location(self) -> str: ...
+
+    @property
+    @abstractmethod
+    def counters_path(self) -> Path: ...
+
+    @abstractmethod
+    def _current_signature(self) -> Any: ...
+
+    @abstractmethod
+    def _durable_signature(self) -> Any: ...
+
+    @abstractmethod
+    def _read_all(self) -> Tuple[List[T], Dict[RowKey, int]]: ...
+
+    @abstractmethod
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]: ...
+
+    @abstractmethod
+    def _write_append(self, rows: List[Dict[str, Any]]) -> None: ...
+
+    @abstractmethod
+    def _write_upsert(self, row: Dict[str, Any], data: T) -> None: ...
+
+    @abstractmethod
+    def _write_remove(self, row: Dict[str, Any], remaining: List[T]) -> None: ...
+
+    @abstractmethod
+    def _write_all(self, items: List[T]) -> None: ...
+
+    def _after_upsert(self) -> None:
+        pass
+
+    def _transaction(self) -> ContextManager[Any]:
+        return nullcontext()
+
+    def _is_cache_fresh(self) -> bool:
+        return self._cache is not None and self._signature == self._current_signature()
+
+    def invalidate(self) -> None:
+        self._cache = None
+        self._signature = None
+
+    def _row_key(self, row: Dict[str, Any]) -> RowKey:
+        return tuple(str(row[field]) for field in self.primary_key or ())
+
+    def _key_positions(self, items: List[T]) -> Dict[RowKey, int]:
+        return {self._row_key(item.to_dict()): position for position, item in enumerate(items)}
+
+    def _set_cache(self, items: List[T], positions: Optional[Dict[RowKey, int]] = None) -> None:
+        self._cache = items
+        if self.primary_key:
+            self._positions = positions if positions is not None else self._key_positions(items)
+        self._stale_indexes = set()
+        for name, index in self.indexes.items():
+            if index.lazy:
+                index.clear()
+                self._stale_indexes.add(name)
+            else:
+                index.build(items)
+        self._mark_counters_dirty()
+
+    def _live_indexes(self) -> List[Index[T]]:
+        return [index for name, index in self.indexes.items() if name not in self._stale_indexes]
+
+    def _apply_upsert(self, items: List[T], positions: Dict[RowKey, int], key: RowKey, data: T) -> Optional[T]:
+        position = positions.get(key)
+        if position is None:
+            positions[key] = len(items)
+            items.append(data)
+            return None
+
+        previous = items[position]
+        items[position] = data
+        return previous
+
+    def _ensure_loaded(self) -> List[T]:
+        with self._lock:
+            if not self._is_cache_fresh():
+                signature = self._current_signature()
+                items, positions = self._read_all()
+                self._set_cache(items, positions)
+                self._signature = signature
+
+            return self._cache
+
+    def load_data(self) -> List[T]:
+        try:
+            return list(self._ensure_loaded())
+        except Exception as e:
+            self.invalidate()
+            Logger.error(f"Error loading data from {self.location}: {e}")
+            raise
+
+    def is_loaded(self) -> bool:
+        return self._is_cache_fresh()
+
+    def iter_data(
+        self,
+        fields: Optional[List[str]] = None,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        lazy: bool = False
+    ) -> Iterator[Any]:
+        try:
+            if self._is_cache_fresh():
+                for item in self._cache:
+                    if where is None and fields is None:
+                        yield item
+                        continue
+
+                    row = item.to_dict()
+                    if where is None or where(row):
+                        yield {field: row[field] for field in fields} if fields else item
+                return
+
+            parsers = getattr(self.model_class, "FIELD_PARSERS", {})
+            for row in self._iter_rows():
+                if where is not None and not where(row):
+                    continue
+
+                if fields:
+                    yield {field: row[field] for field in fields}
+                    continue
+
+                if lazy:
+                    yield LazyRecord(row, self.model_class, parsers)
+                    continue
+
+                try:
+                    yield self.model_class.from_dict(row)
+                except Exception as parse_error:
+                    Logger.error(f"Error parsing row {row}: {parse_error}")
+        except Exception as e:
+            Logger.error(f"Error streaming data from {self.location}: {e}")
+            raise
+
+    def exists(self, index_name: str, field: str, key: Any) -> bool:
+        index = self.indexes[index_name]
+        with self._lock:
+            if self._is_cache_fresh():
+                return key in self._index(index_name)
+
+        normalized = index.normalize(str(key))
+        matches = self.iter_data(fields=[field], where=lambda row: index.normalize(str(row[field])) == normalized)
+        return next(matches, None) is not None
+
+    def _index(self, index_name: str) -> Index[T]:
+        try:
+            with self._lock:
+                items = self._ensure_loaded()
+                index = self.indexes[index_name]
+                if index_name in self._stale_indexes:
+                    index.build(items)
+                    self._stale_indexes.discard(index_name)
+                return index
+        except Exception as e:
+            self.invalidate()
+            Logger.error(f"Error reading index '{index_name}' of {self.location}: {e}")
+            raise
+
+    def get_index(self, index_name: str) -> Index[T]:
+        return self._index(index_name)
+
+    def lookup(self, index_name: str, key: Any) -> Optional[T]:
+        with self._lock:
+            return self._index(index_name).get(key)
+
+    def lookup_all(self, index_name: str, key: Any) -> List[T]:
+        with self._lock:
+            return self._index(index_name).get(key)
+
+    def indexed_values(self, index_name: str) -> List[T]:
+        with self._lock:
+            return self._index(index_name).values()
+
+    def complete(self, index_name: str, prefix: str, limit: int = 10) -> List[str]:
+        with self._lock:
+            return self._index(index_name).complete(prefix, limit)
+
+    def suggest(self, index_name: str, prefix: str, limit: int = 10) -> List[T]:
+        with self._lock:
+            return self._index(index_name).get(prefix, limit)
+
+    def count_by(self, field: str) -> Dict[str, int]:
+        return dict(Counter(str(row[field]) for row in self.iter_data(fields=[field])))
+
+    def _counter_indexes(self) -> Dict[str, CounterIndex[T]]:
+        return {name: index for name, index in self.indexes.items() if isinstance(index, CounterIndex)}
+
+    def _mark_counters_dirty(self) -> None:
+        if self._counter_indexes():
+            _dirty_storages.add(self)
+
+    def counts(self, index_name: str) -> Dict[str, int]:
+        index = self.indexes[index_name]
+        if not isinstance(index, CounterIndex):
+            raise ValueError(f"Index '{index_name}' of {self.location} is not a counter")
+
+        if self._is_cache_fresh():
+            return index.counts()
+
+        persisted = self._read_persisted_counters()
+        if persisted is not None and index_name in persisted:
+            return dict(persisted[index_name])
+
+        return self._count_fallback(index_name, index)
+
+    def _count_fallback(self, index_name: str, index: CounterIndex[T]) -> Dict[str, int]:
+        signature = self._durable_signature()
+        counters = {name: copy.copy(counter) for name, counter in self._counter_indexes().items()}
+        for counter in counters.values():
+            counter.clear()
+
+        for item in self.iter_data(lazy=True):
+            for counter in counters.values():
+                counter.add(item)
+
+        counts = {name: counter.counts() for name, counter in counters.items()}
+        if self._durable_signature() == signature:
+            self._persisted_counters = (json.loads(json.dumps(signature)), counts)
+            self._write_counters(signature, counts)
+        return dict(counts[index_name])
+
+    def _read_persisted_counters(self) -> Optional[Dict[str, Dict[str, int]]]:
+        signature = json.loads(json.dumps(self._durable_signature()))
+        if self._persisted_counters is not None and self._persisted_counters[0] == signature:
+            return self._persisted_counters[1]
+
+        try:
+            with self.counters_path.open("r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            Logger.warning(f"Ignoring unreadable counters file {self.counters_path}: {e}")
+            return None
+
+        if snapshot.get("signature") != signature:
+            return None
+
+        self._persisted_counters = (signature, snapshot.get("counters", {}))
+        return self._persisted_counters[1]
+
+    def flush_counters(self) -> None:
+        counters = self._counter_indexes()
+        if not counters or not self._is_cache_fresh():
+            return
+
+        if self._write_counters(self._durable_signature(), {name: index.counts() for name, index in counters.items()}):
+            _dirty_storages.discard(self)
+
+    def _write_counters(self, signature: Any, counters: Dict[str, Dict[str, int]]) -> bool:
+        temp_path = self.counters_path.with_name(self.counters_path.name + ".tmp")
+        try:
+            with temp_path.open("w", encoding="utf-8") as file:
+                json.dump({"signature": signature, "counters": counters}, file, ensure_ascii=False)
+            os.replace(temp_path, self.counters_path)
+            return True
+        except Exception as e:
+            Logger.error(f"Error saving counters to {self.counters_path}: {e}")
+            return False
+
+    def add_data(self, data: T) -> None:
+        self.add_many([data])
+
+    def add_many(self, items: List[T]) -> None:
+        if not items:
+            return
+
+        with self._lock, self._transaction():
+            was_fresh = self._is_cache_fresh()
+            rows = [item.to_dict() for item in items]
+            try:
+                self._write_append(rows)
+            except Exception as e:
+                self.invalidate()
+                Logger.error(f"Error adding data to {self.location}: {e}")
+                raise
+
+            if was_fresh and self._cache is not None:
+                for row, item in zip(rows, items):
+                    if self.primary_key:
+                        self._positions[self._row_key(row)] = len(self._cache)
+                    self._cache.append(item)
+                    for index in self._live_indexes():
+                        index.add(item)
+                self._signature = self._current_signature()
+                self._mark_counters_dirty()
+            else:
+                self.invalidate()
+
+    def upsert_data(self, data: T) -> None:
+        if not self.primary_key:
+            raise ValueError(f"{self.location} has no primary key to upsert on")
+
+        with self._lock, self._transaction():
+            was_fresh = self._is_cache_fresh()
+            row = data.to_dict()
+            try:
+                self._write_upsert(row, data)
+            except Exception as e:
+                self.invalidate()
+                Logger.error(f"Error upserting data in {self.location}: {e}")
+                raise
+
+            if was_fresh and self._cache is not None:
+                previous = self._apply_upsert(self._cache, self._positions, self._row_key(row), data)
+                for index in self._live_indexes():
+                    if previous is not None:
+                        index.discard(previous)
+                    index.add(data)
+                self._signature = self._current_signature()
+                self._mark_counters_dirty()
+            else:
+                self.invalidate()
+
+            self._after_upsert()
+
+    def remove_data(self, data: T) -> None:
+        with self._lock, self._transaction():
+            items = self.load_data()
+            removed = items.pop(items.index(data))
+            try:
+                self._write_remove(removed.to_dict(), items)
+            except Exception as e:
+                self.invalidate()
+                Logger.error(f"Error removing data from {self.location}: {e}")
+                raise
+
+            self._cache = items
+            if self.primary_key:
+                self._positions = self._key_positions(items)
+            for index in self._live_indexes():
+                index.discard(removed)
+            self._signature = self._current_signature()
+            self._mark_counters_dirty()
+
+    def update_data(self, new_data: List[T]) -> None:
+        with self._lock, self._transaction():
+            if self._cache is not None and self._signature != self._current_signature():
+                self.invalidate()
+                Logger.error(f"Refusing to rewrite {self.location}: it changed since it was loaded")
+                raise RuntimeError(f"{self.location} changed since it was loaded; reload before rewriting")
+
+            try:
+                self._write_all(new_data)
+            except Exception as e:
+                self.invalidate()
+                Logger.error(f"Error updating data in {self.location}: {e}")
+                raise
+
+            self._set_cache(list(new_data))
+            self._signature = self._current_signature()
+
+
+@atexit.register
+def _flush_dirty_counters() -> None:
+    for storage in list(_dirty_storages):
+        storage.flush_counters()
+
+
+def open_storage(
+    name: str,
+    headers: List[str],
+    model_class: Type[T],
+    indexes: Optional[Dict[str, Index[T]]] = None,
+    primary_key: Optional[Tuple[str, ...]] = None,
+    journaled: bool = False,
+    indexed_columns: Optional[List[Tuple[str, ...]]] = None,
+    backend: Optional[str] = None,
+    partition_by: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+    hot_indexes: Optional[Dict[str, Index[T]]] = None
+) -> Storage[T]:
+    backend = backend or config.STORAGE_BACKEND
+
+    if backend == "csv" and partition_by is not None and config.PARTITIONED_STORAGE:
+        from shared.partitioned_storage import PartitionedStorage
+        return PartitionedStorage(
+            directory=f"{config.DATA_DIR}/{name}",
+            headers=headers,
+            model_class=model_class,
+            partition_by=partition_by,
+            indexes=indexes,
+            hot_indexes=hot_indexes,
+            primary_key=primary_key,
+            lock_timeout=config.LOCK_TIMEOUT,
+            durability=config.DURABILITY,
+            group_commit_ms=config.GROUP_COMMIT_MS,
+            write_buffer_ms=config.WRITE_BUFFER_MS,
+            write_buffer_rows=config.WRITE_BUFFER_ROWS
+        )
+
+    indexes = {**(hot_indexes or {}), **(indexes or {})}
+
+    if backend == "csv":
+        from shared.file_manager import FileManager
+        return FileManager(
+            filename=f"{config.DATA_DIR}/{name}.csv",
+            headers=headers,
+            model_class=model_class,
+            indexes=indexes,
+            primary_key=primary_key,
+            journal_filename=f"{config.DATA_DIR}/{name}_journal.csv" if journaled else None,
+            durability=config.DURABILITY,
+            lock_timeout=config.LOCK_TIMEOUT,
+            group_commit_ms=config.GROUP_COMMIT_MS,
+            write_buffer_ms=config.WRITE_BUFFER_MS,
+            write_buffer_rows=config.WRITE_BUFFER_ROWS
+        )
+    elif backend == "sqlite":
+        from shared.sqlite_manager import SQLiteManager
+        return SQLiteManager(
+            database=f"{config.DATA_DIR}/{config.SQLITE_FILENAME}",
+            table=name,
+            headers=headers,
+            model_class=model_class,
+            indexes=indexes,
+            primary_key=primary_key,
+            indexed_columns=indexed_columns,
+            durability=config.DURABILITY
+        )
+
+    raise ValueError(f"Unknown storage backend: {backend}")